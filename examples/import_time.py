@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+# Each import is timed in a fresh interpreter so nothing is already cached
+IMPORTS = {
+    'runtime (ml_genn)': 'import ml_genn',
+    'conversion (ml_genn.converters)': 'import ml_genn, ml_genn.converters',
+    'plotting (ml_genn.utils.plotting)': 'import ml_genn, ml_genn.utils.plotting',
+}
+
+CHILD_CODE = '''
+import resource
+from time import perf_counter
+start_time = perf_counter()
+{}
+import_time = perf_counter() - start_time
+print(import_time, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Cold-start import time benchmark')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, statement in IMPORTS.items():
+        times = []
+        max_rss = []
+        for r in range(args.repeats):
+            output = subprocess.check_output([sys.executable, '-c', CHILD_CODE.format(statement)])
+            import_time, rss = output.split()[-2:]
+            times.append(float(import_time))
+            max_rss.append(int(rss))
+
+        # **NOTE** ru_maxrss is in KiB on Linux
+        print('%s: best import time:%fs, max RSS:%fMiB' % (name, min(times), max(max_rss) / 1024.0))
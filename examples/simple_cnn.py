@@ -48,22 +48,51 @@ if __name__ == '__main__':
     # Create a suitable converter to convert TF model to ML GeNN
     converter = args.build_converter(x_norm, K=8, norm_time=500)
 
+    # Record spikes on device for whole presentations if any samples are saved
+    time = 8 if args.converter == 'few-spike' else 500
+    if args.converter == 'ttfs':
+        time = converter.calc_presentation_time(tf_model, args.dt)
+    elif args.converter == 'phase':
+        time = converter.K * args.phase_periods * args.dt
+    num_recording_timesteps = int(round(time / args.dt)) if args.save_samples else None
+
     # Convert and compile ML GeNN model
     mlg_model = Model.convert_tf_model(
         tf_model, converter=converter, connectivity_type=args.connectivity_type,
+        integrator_output=args.integrator_output,
         dt=args.dt, batch_size=args.batch_size, rng_seed=args.rng_seed, 
-        kernel_profiling=args.kernel_profiling)
+        kernel_profiling=args.kernel_profiling, num_recording_timesteps=num_recording_timesteps,
+        device_dataset_size=x_test.shape[0] if args.device_dataset else None,
+        device_top_k=args.device_top_k, cache_dir=args.cache_dir)
 
-    time = 8 if args.converter == 'few-spike' else 500
     mlg_eval_start_time = perf_counter()
-    acc, spk_i, spk_t = mlg_model.evaluate([x_test], [y_test], time, save_samples=args.save_samples)
-    print("MLG evaluation:%f" % (perf_counter() - mlg_eval_start_time))
+    acc, spk_i, spk_t = mlg_model.evaluate([x_test], [y_test], time, save_samples=args.save_samples,
+                                           fused_steps=args.fused_steps,
+                                           early_exit_margin=args.early_exit_margin,
+                                           early_exit_interval=args.early_exit_interval)
+    mlg_eval_time = perf_counter() - mlg_eval_start_time
+    print("MLG evaluation:%f" % mlg_eval_time)
+    print("MLG per-sample latency:%fms" % (1000.0 * mlg_eval_time / x_test.shape[0]))
 
     if args.kernel_profiling:
         print("Kernel profiling:")
         for n, t in iteritems(mlg_model.get_kernel_times()):
             print("\t%s: %fs" % (n, t))
 
+    # Time a presentation with no input to measure the cost of padding
+    # lanes of partial batches and presentations which flush the pipeline
+    n_presentations = -(-x_test.shape[0] // args.batch_size) + mlg_model.calc_pipeline_depth()
+    n_padding_lanes = n_presentations * args.batch_size - x_test.shape[0]
+    mlg_model.clear_input()
+    mlg_model.reset()
+    mlg_empty_start_time = perf_counter()
+    mlg_model.step_time(mlg_model.calc_timesteps(time))
+    mlg_empty_time = perf_counter() - mlg_empty_start_time
+    print("MLG empty presentation:%fms (mean presentation:%fms)" % (
+        1000.0 * mlg_empty_time, 1000.0 * mlg_eval_time / n_presentations))
+    print("MLG padding:%d lanes, approx. %fms" % (
+        n_padding_lanes, 1000.0 * mlg_empty_time * n_padding_lanes / args.batch_size))
+
     # Report ML GeNN model results
     print('Accuracy of SimpleCNN GeNN model: {}%'.format(acc[0]))
     if args.plot:
@@ -0,0 +1,78 @@
+import tensorflow as tf
+from tensorflow.keras import models, layers, datasets
+from ml_genn import Model
+from ml_genn.converters import SpikeNorm
+from ml_genn.utils import parse_arguments
+import numpy as np
+from time import perf_counter
+
+
+class DeferredSpikeNorm(SpikeNorm):
+    # Skip calibration when converting so it can be timed separately
+    def post_compile(self, mlg_model):
+        pass
+
+
+if __name__ == '__main__':
+    args = parse_arguments('SpikeNorm calibration time benchmark')
+    print('arguments: ' + str(vars(args)))
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Retrieve and normalise MNIST dataset
+    (x_train, y_train), _ = datasets.mnist.load_data()
+    x_train = x_train[:args.n_train_samples].reshape((-1, 28, 28, 1)) / 255.0
+    y_train = y_train[:args.n_train_samples]
+    x_norm = x_train[np.random.choice(x_train.shape[0], args.n_norm_samples, replace=False)]
+
+    # Load TensorFlow model trained by simple_cnn.py or train a new one
+    if args.reuse_tf_model:
+        tf_model = models.load_model('simple_cnn_tf_model')
+    else:
+        tf_model = models.Sequential([
+            layers.Conv2D(16, 5, padding='valid', activation='relu', use_bias=False, input_shape=x_train.shape[1:]),
+            layers.AveragePooling2D(2),
+            layers.Conv2D(8, 5, padding='valid', activation='relu', use_bias=False),
+            layers.AveragePooling2D(2),
+            layers.Flatten(),
+            layers.Dense(128, activation='relu', use_bias=False),
+            layers.Dense(64, activation='relu', use_bias=False),
+            layers.Dense(y_train.max() + 1, activation='softmax', use_bias=False),
+        ], name='simple_cnn')
+        tf_model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+        tf_model.fit(x_train, y_train, epochs=1)
+
+    # Convert and compile ML GeNN model, deferring calibration
+    # so each calibration is run and timed exactly once below
+    norm_time = 500
+    exact_converter = SpikeNorm(norm_data=[x_norm], norm_time=norm_time, input_type=args.input_type)
+    mlg_model = Model.convert_tf_model(
+        tf_model, converter=DeferredSpikeNorm(norm_data=[x_norm], norm_time=norm_time,
+                                              input_type=args.input_type),
+        connectivity_type=args.connectivity_type, dt=args.dt, batch_size=args.batch_size,
+        rng_seed=args.rng_seed, cache_dir=args.cache_dir)
+
+    # Time exact calibration
+    start_time = perf_counter()
+    exact_converter.post_compile(mlg_model)
+    exact_time = perf_counter() - start_time
+    exact_thresholds = [np.asarray(l.neurons.threshold) for l in mlg_model.layers[1:]]
+
+    # Time calibration which moves on to the next layer once thresholds converge
+    patience = 4 if args.norm_patience is None else args.norm_patience
+    staged_converter = SpikeNorm(norm_data=[x_norm], norm_time=norm_time,
+                                 input_type=args.input_type, patience=patience)
+    start_time = perf_counter()
+    staged_converter.post_compile(mlg_model)
+    staged_time = perf_counter() - start_time
+    staged_thresholds = [np.asarray(l.neurons.threshold) for l in mlg_model.layers[1:]]
+
+    print("Exact calibration:%fs" % exact_time)
+    print("Calibration with patience %d:%fs" % (patience, staged_time))
+    print("Speedup:%fx" % (exact_time / staged_time))
+
+    # Report how far thresholds found with patience are from exact ones
+    for layer, exact, staged in zip(mlg_model.layers[1:], exact_thresholds, staged_thresholds):
+        print("Layer <%s> exact threshold:%s, with patience:%s, max relative difference:%f" % (
+            layer.name, exact, staged, np.max(np.abs(1.0 - (staged / exact)))))
@@ -1,2 +1,20 @@
+from importlib import import_module
+
 from ml_genn.model import Model
+from ml_genn.metrics import Metrics
 from ml_genn.save_load import save_model, load_model
+
+# Conversion and plotting pull in TensorFlow and matplotlib
+# so are only imported when they are first accessed
+_lazy_modules = {'converters': 'ml_genn.converters',
+                 'utils': 'ml_genn.utils'}
+_lazy_attributes = {'raster_plot': 'ml_genn.utils.plotting',
+                    'parse_arguments': 'ml_genn.utils.arguments'}
+
+def __getattr__(name):
+    if name in _lazy_modules:
+        return import_module(_lazy_modules[name])
+    elif name in _lazy_attributes:
+        return getattr(import_module(_lazy_attributes[name]), name)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
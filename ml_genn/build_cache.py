@@ -0,0 +1,214 @@
+"""Content-addressed cache of compiled GeNN models
+
+This module provides the ``BuildCache`` class which stores each compiled
+GeNN model in a directory of a cache directory named by a hash of everything
+that affects the generated code: the network graph, the neuron and synapse
+models and their compiled-in parameters, the ML GeNN source, the PyGeNN
+version and compile options such as batch size, dt and precision. Weights
+and thresholds are excluded as they are loaded at runtime, so models which
+only differ in these share a build.
+
+Builds are serialised with a file lock per entry so processes compiling the
+same model wait for each other rather than sharing a half-built directory,
+and least recently used entries are evicted once the cache grows too large.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from enum import Enum
+
+import pygenn
+
+# Attributes of layers, neurons and synapses which are loaded at
+# runtime or refer to other objects so don't affect generated code
+_RUNTIME_ATTRIBUTES = set(['weights', 'threshold', 'source', 'target',
+                           'nrn', 'syn', 'neurons', 'downstream_synapses',
+                           'upstream_synapses', 'dataset_update',
+                           'lane_reset', 'top_k_updates'])
+
+_source_hash = None
+
+
+@contextmanager
+def _file_lock(path):
+    # Hold an exclusive lock on a lock file
+    if os.name == 'nt':
+        import msvcrt
+        with open(path, 'a+') as lock_file:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        while True:
+            with open(path, 'a+') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                # If lock file was unlinked by eviction while waiting for
+                # it, lock is on a stale file so try again with a new one
+                try:
+                    current = os.stat(path).st_ino == os.fstat(lock_file.fileno()).st_ino
+                except FileNotFoundError:
+                    current = False
+
+                if current:
+                    try:
+                        yield
+                    finally:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    return
+                else:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _get_source_hash():
+    # Hash ML GeNN source once as it defines the GeNN models used
+    global _source_hash
+    if _source_hash is None:
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        source_hash = hashlib.sha256()
+        for root, dirs, files in os.walk(package_dir):
+            dirs.sort()
+            for f in sorted(files):
+                if f.endswith('.py'):
+                    path = os.path.join(root, f)
+                    source_hash.update(os.path.relpath(path, package_dir).encode())
+                    with open(path, 'rb') as source_file:
+                        source_hash.update(source_file.read())
+        _source_hash = source_hash.hexdigest()
+    return _source_hash
+
+
+def _describe_object(obj):
+    # Describe class and compile-time configuration of object
+    desc = {'class': '{}.{}'.format(type(obj).__module__, type(obj).__name__)}
+    for name, value in vars(obj).items():
+        if name in _RUNTIME_ATTRIBUTES:
+            continue
+        if isinstance(value, Enum):
+            desc[name] = value.value
+        elif isinstance(value, (bool, int, float, str, tuple, list, type(None))):
+            desc[name] = value
+    return desc
+
+
+def describe_model(mlg_model):
+    """Describe network graph of ML GeNN model in terms of everything that affects generated code"""
+    layers = []
+    for layer in mlg_model.layers:
+        layer_desc = _describe_object(layer)
+        layer_desc['neurons'] = _describe_object(layer.neurons)
+        layer_desc['upstream_synapses'] = [dict(_describe_object(s), source=s.source().name)
+                                           for s in layer.upstream_synapses]
+        layers.append(layer_desc)
+
+    return {'name': mlg_model.name,
+            'layers': layers,
+            'inputs': [l.name for l in mlg_model.inputs],
+            'outputs': [l.name for l in mlg_model.outputs]}
+
+
+class BuildCache(object):
+    """Cache of compiled GeNN models"""
+
+    def __init__(self, cache_dir, max_entries=16):
+        """Create a build cache
+
+        Args:
+        cache_dir    --  directory to store compiled models in
+
+        Keyword args:
+        max_entries  --  maximum number of compiled models to keep (default: 16)
+        """
+
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_key(self, mlg_model, **options):
+        """Calculate key of ML GeNN model compiled with given options
+
+        Args:
+        mlg_model  --  ML GeNN model with network set
+
+        Keyword args:
+        options    --  compile options which affect generated code
+        """
+
+        desc = {'model': describe_model(mlg_model),
+                'options': options,
+                'source': _get_source_hash(),
+                'pygenn': getattr(pygenn, '__version__', None)}
+        desc_json = json.dumps(desc, sort_keys=True, default=str)
+        return hashlib.sha256(desc_json.encode()).hexdigest()[:32]
+
+    def build_and_load(self, g_model, key, **load_kwargs):
+        """Load GeNN model from cache entry, building it first if entry doesn't exist
+
+        Args:
+        g_model      --  GeNN model to build and load
+        key          --  key of model calculated with get_key
+
+        Keyword args:
+        load_kwargs  --  keyword arguments to pass to GeNNModel.load
+        """
+
+        path = os.path.join(self.cache_dir, key)
+        complete_path = os.path.join(path, 'complete')
+        with _file_lock(path + '.lock'):
+            # If entry hasn't been (completely) built, build it
+            if not os.path.isfile(complete_path):
+                os.makedirs(path, exist_ok=True)
+                g_model.build(path_to_model=path + os.sep)
+                open(complete_path, 'w').close()
+            # Otherwise, mark it as recently used
+            else:
+                os.utime(complete_path, None)
+
+            g_model.load(path_to_model=path + os.sep, **load_kwargs)
+
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until cache has at most max_entries
+
+        Keyword args:
+        keep  --  key of entry not to delete (default: None)
+        """
+
+        with _file_lock(os.path.join(self.cache_dir, 'cache.lock')):
+            # Find complete entries, sorted by when they were last used
+            entries = []
+            for key in os.listdir(self.cache_dir):
+                complete_path = os.path.join(self.cache_dir, key, 'complete')
+                if os.path.isfile(complete_path):
+                    entries.append((os.path.getmtime(complete_path), key))
+            entries.sort()
+
+            # Delete oldest entries, waiting until nothing is building or loading them
+            n_evict = len(entries) - self.max_entries
+            for mtime, key in entries:
+                if n_evict <= 0:
+                    break
+                if key == keep:
+                    continue
+
+                path = os.path.join(self.cache_dir, key)
+                with _file_lock(path + '.lock'):
+                    shutil.rmtree(path, ignore_errors=True)
+
+                    # Delete entry's lock file too so evicted entries leave nothing behind
+                    # **NOTE** processes already waiting on it notice it's gone and lock a new one.
+                    # Windows can't delete open files so lock files are left behind there
+                    try:
+                        os.remove(path + '.lock')
+                    except OSError:
+                        pass
+                n_evict -= 1
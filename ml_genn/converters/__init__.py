@@ -3,3 +3,5 @@ from ml_genn.converters.simple import Simple
 from ml_genn.converters.few_spike import FewSpike
 from ml_genn.converters.data_norm import DataNorm
 from ml_genn.converters.spike_norm import SpikeNorm
+from ml_genn.converters.ttfs import TTFS
+from ml_genn.converters.phase import Phase
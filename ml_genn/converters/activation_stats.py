@@ -0,0 +1,138 @@
+"""Streaming statistics of layer activations
+
+This module provides the ``ActivationStats`` class which accumulates the
+maximum, per-channel maximum and a histogram of one layer's activations
+batch by batch, and ``calc_activation_stats`` which gathers them for the
+weighted layers of a TensorFlow model, so normalisation data of any size
+is processed in bounded memory. Histogram bins are logarithmically spaced
+with fixed edges so statistics gathered over different shards of the
+normalisation data (e.g. in separate processes) can be combined with ``merge``.
+
+Example:
+    The following calculates the 99.9th percentile activation of each layer:
+
+        from ml_genn.converters.activation_stats import calc_activation_stats
+
+        stats = calc_activation_stats(tf_model, weighted_layers, [x_norm])
+        print([stats[l.name].percentile(99.9) for l in weighted_layers])
+"""
+
+import numpy as np
+import tensorflow as tf
+
+# Histogram bins span 2^MIN_EXPONENT to 2^MAX_EXPONENT with BINS_PER_OCTAVE
+# bins per power of two so percentiles are within ~2% of their true value
+MIN_EXPONENT = -32
+MAX_EXPONENT = 32
+BINS_PER_OCTAVE = 32
+NUM_BINS = (MAX_EXPONENT - MIN_EXPONENT) * BINS_PER_OCTAVE
+
+
+class ActivationStats(object):
+    """Statistics of one layer's activations"""
+
+    def __init__(self):
+        self.n_values = 0
+        self.n_non_positive = 0
+        self.max = -np.inf
+        self.channel_max = None
+        self.histogram = np.zeros(NUM_BINS, dtype=np.int64)
+
+    def update(self, activations):
+        """Add a batch of activations
+
+        Args:
+        activations  --  array of activations with channels on the last axis
+        """
+
+        activations = np.asarray(activations).reshape(-1, np.shape(activations)[-1])
+
+        # Update maxima
+        channel_max = activations.max(axis=0).astype(np.float64)
+        if self.channel_max is None:
+            self.channel_max = channel_max
+        else:
+            self.channel_max = np.maximum(self.channel_max, channel_max)
+        self.max = max(self.max, float(channel_max.max()))
+
+        # Add positive activations to histogram
+        positive = activations[activations > 0.0]
+        bins = np.floor(np.log2(positive) * BINS_PER_OCTAVE).astype(np.int64)
+        bins = np.clip(bins - (MIN_EXPONENT * BINS_PER_OCTAVE), 0, NUM_BINS - 1)
+        self.histogram += np.bincount(bins, minlength=NUM_BINS)
+
+        self.n_non_positive += activations.size - positive.size
+        self.n_values += activations.size
+
+    def merge(self, other):
+        """Add statistics accumulated by another ActivationStats object
+
+        Args:
+        other  --  ActivationStats object of the same layer
+        """
+
+        if other.channel_max is None:
+            return
+        elif self.channel_max is None:
+            self.channel_max = other.channel_max.copy()
+        elif other.channel_max.shape != self.channel_max.shape:
+            raise ValueError('cannot merge statistics with different numbers of channels')
+        else:
+            self.channel_max = np.maximum(self.channel_max, other.channel_max)
+
+        self.max = max(self.max, other.max)
+        self.histogram += other.histogram
+        self.n_non_positive += other.n_non_positive
+        self.n_values += other.n_values
+
+    def percentile(self, q):
+        """Approximate percentile of activations, rounded up to the edge of its histogram bin
+
+        Args:
+        q  --  percentile between 0 and 100
+        """
+
+        if self.n_values == 0:
+            raise ValueError('no activations have been added')
+
+        # Find rank of percentile
+        rank = int(np.ceil((q / 100.0) * self.n_values))
+        if rank <= self.n_non_positive:
+            return min(self.max, 0.0)
+
+        # Find bin containing it and return the bin's upper edge
+        # **NOTE** upper edge of the last bin is clipped to the exact maximum
+        b = np.searchsorted(np.cumsum(self.histogram), rank - self.n_non_positive)
+        upper_edge = 2.0 ** ((b + 1 + (MIN_EXPONENT * BINS_PER_OCTAVE)) / BINS_PER_OCTAVE)
+        return min(self.max, upper_edge)
+
+
+def calc_activation_stats(tf_model, layers, data, batch_size=256):
+    """Calculate statistics of layer activations by streaming data through TensorFlow model
+
+    Args:
+    tf_model    --  TensorFlow model
+    layers      --  list of layers of TensorFlow model to gather statistics of
+    data        --  list of (memory-mapped) arrays for each input of TensorFlow model
+
+    Keyword args:
+    batch_size  --  number of samples to process at once (default: 256)
+
+    Returns:
+    stats       --  dictionary of ActivationStats objects, indexed by layer name
+    """
+
+    # Get output functions for layers
+    get_outputs = tf.keras.backend.function(
+        tf_model.inputs, [l.output for l in layers])
+
+    # Accumulate statistics of each batch's outputs
+    stats = {l.name: ActivationStats() for l in layers}
+    n_samples = data[0].shape[0]
+    for batch_start in range(0, n_samples, batch_size):
+        batch_end = min(batch_start + batch_size, n_samples)
+        outputs = get_outputs([x[batch_start:batch_end] for x in data])
+        for l, out in zip(layers, outputs):
+            stats[l.name].update(out)
+
+    return stats
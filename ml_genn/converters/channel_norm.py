@@ -0,0 +1,50 @@
+"""Helpers for per-channel threshold balancing
+
+With per-channel normalisation, each channel of a layer gets its own
+threshold so channels with small activations still fire at a useful rate.
+To keep the input to downstream layers on the same scale as with a single
+layer-wise threshold, the weights from each channel are multiplied by the
+channel's threshold relative to the layer's largest threshold.
+"""
+
+import numpy as np
+
+
+def tile_channels(channel_values, shape):
+    """Tile per-channel values to each neuron of a layer with channels on the last axis
+
+    Args:
+    channel_values  --  array of values for each channel
+    shape           --  shape of layer
+    """
+
+    channel_values = np.asarray(channel_values, dtype=np.float64)
+    return np.tile(channel_values, int(np.prod(shape)) // len(channel_values))
+
+
+def get_channel_thresholds(layer):
+    """Get per-channel thresholds of layer whose neurons have per-neuron thresholds"""
+    return np.reshape(layer.neurons.threshold, (-1, layer.shape[-1]))[0]
+
+
+def scale_downstream_weights(layer):
+    """Scale weights from each channel of layer by its threshold relative to the layer's largest threshold
+
+    Args:
+    layer  --  layer whose neurons have per-channel thresholds
+    """
+
+    channel_thresholds = get_channel_thresholds(layer)
+    factors = channel_thresholds / np.max(channel_thresholds)
+
+    for synapse in layer.downstream_synapses:
+        weights = synapse.get_weights()
+
+        # Convolution kernels have input channels on their third axis
+        if weights.ndim == 4:
+            weights *= factors[np.newaxis, np.newaxis, :, np.newaxis]
+        # Otherwise, weights are indexed by (flattened) input neuron
+        else:
+            weights *= np.tile(factors, weights.shape[0] // len(factors))[:, np.newaxis]
+
+        synapse.set_weights(weights)
@@ -3,19 +3,36 @@ import numpy as np
 from collections import namedtuple
 
 from ml_genn.layers import InputType
+from ml_genn.layers import ResetMode
 from ml_genn.layers import IFNeurons
 from ml_genn.layers import SpikeInputNeurons
 from ml_genn.layers import PoissonInputNeurons
 from ml_genn.layers import IFInputNeurons
+from ml_genn.converters.activation_stats import calc_activation_stats
+from ml_genn.converters.channel_norm import tile_channels, scale_downstream_weights
+from ml_genn.converters.norm_cache import cached, get_tf_model_key
 
 # Because we want the converter class to be reusable, we don't want the
 # normalisation data to be a member, instead we encapsulate it in a tuple
 PreCompileOutput = namedtuple('PreCompileOutput', ['thresholds'])
 
 class DataNorm(object):
-    def __init__(self, norm_data, input_type=InputType.POISSON):
+    def __init__(self, norm_data, input_type=InputType.POISSON, cache_dir=None,
+                 norm_batch_size=256, percentile=None, per_channel=False,
+                 reset=ResetMode.ZERO, max_spikes=1):
         self.norm_data = norm_data
         self.input_type = InputType(input_type)
+        self.reset = ResetMode(reset)
+        self.max_spikes = max_spikes
+        self.cache_dir = cache_dir
+        self.norm_batch_size = norm_batch_size
+
+        # If percentile is set, normalise by this percentile of each
+        # layer's activations rather than the maximum activation
+        self.percentile = percentile
+
+        # If per_channel is set, each channel of each layer except the output layer gets its own threshold
+        self.per_channel = per_channel
 
     def validate_tf_layer(self, tf_layer):
         if tf_layer.activation != tf.keras.activations.relu:
@@ -33,22 +50,49 @@ class DataNorm(object):
         elif self.input_type == InputType.POISSON_SIGNED:
             return PoissonInputNeurons(signed_spikes=True)
         elif self.input_type == InputType.IF:
-            return IFInputNeurons()
+            return IFInputNeurons(reset=self.reset)
 
     def create_neurons(self, tf_layer, pre_compile_output):
-        return IFNeurons(threshold=pre_compile_output.thresholds[tf_layer])
+        threshold = pre_compile_output.thresholds[tf_layer]
+        if np.ndim(threshold) > 0:
+            return IFNeurons(threshold=tile_channels(threshold, tf_layer.output_shape[1:]),
+                             reset=self.reset, max_spikes=self.max_spikes)
+        else:
+            return IFNeurons(threshold=threshold, reset=self.reset, max_spikes=self.max_spikes)
 
     def pre_compile(self, tf_model):
-        # Get output functions for weighted layers.
-        idx = [i for i, layer in enumerate(tf_model.layers)
-               if len(layer.get_weights()) > 0]
-        weighted_layers = [tf_model.layers[i] for i in idx]
-        get_outputs = tf.keras.backend.function(
-            tf_model.inputs, [layer.output for layer in weighted_layers])
+        # Get weighted layers
+        weighted_layers = [l for l in tf_model.layers
+                           if len(l.get_weights()) > 0]
+
+        # Calculate thresholds, reading them from cache if possible
+        results = cached(self.cache_dir,
+                         lambda: get_tf_model_key('data-norm', tf_model, self.norm_data,
+                                                  percentile=self.percentile,
+                                                  per_channel=self.per_channel),
+                         lambda: self._calc_thresholds(tf_model, weighted_layers))
+
+        for layer in weighted_layers:
+            print('layer <{}> threshold: {}'.format(layer.name, results['thresholds'][layer.name]))
+
+        # Build dictionary of thresholds for each layer
+        thresholds = {layer: results['thresholds'][layer.name]
+                      for layer in weighted_layers}
 
-        # Find the maximum activation in each layer, given input data.
-        max_activation = np.array([np.max(out) for out in get_outputs(self.norm_data)],
-                                  dtype=np.float64)
+        return PreCompileOutput(thresholds=thresholds)
+
+    def _calc_thresholds(self, tf_model, weighted_layers):
+        # Stream input data through model to get statistics of each layer's activations
+        stats = calc_activation_stats(tf_model, weighted_layers, self.norm_data,
+                                      batch_size=self.norm_batch_size)
+
+        # Find the maximum (or percentile) activation in each layer
+        if self.percentile is None:
+            max_activation = np.array([stats[layer.name].max for layer in weighted_layers],
+                                      dtype=np.float64)
+        else:
+            max_activation = np.array([stats[layer.name].percentile(self.percentile)
+                                       for layer in weighted_layers], dtype=np.float64)
 
         # Find the maximum weight in each layer.
         max_weights = np.array([np.max(w) for w in tf_model.get_weights()],
@@ -60,14 +104,30 @@ class DataNorm(object):
         applied_factors[0] = scale_factors[0]
         applied_factors[1:] = scale_factors[1:] / scale_factors[:-1]
 
-        for layer, threshold in zip(weighted_layers, applied_factors):
-            print('layer <{}> threshold: {}'.format(layer.name, threshold))
+        if self.per_channel:
+            # Scale each channel by its own maximum (or percentile) activation,
+            # bounded below by the maximum weight like the layer-wise scale factor
+            # **NOTE** post_compile scales weights from each channel by its scale
+            # factor relative to the layer's so the input to the next layer is unchanged
+            # **NOTE** output layer has no downstream weights to compensate in so it keeps a
+            # layer-wise threshold, otherwise its spike counts would not be comparable between classes
+            prev_scale_factors = np.concatenate([[1.0], scale_factors[:-1]])
+            thresholds = {}
+            for layer, max_act, max_weight, prev_scale in zip(weighted_layers[:-1], max_activation,
+                                                               max_weights, prev_scale_factors):
+                channel_scales = np.maximum(np.minimum(stats[layer.name].channel_max, max_act),
+                                            max_weight)
+                thresholds[layer.name] = (channel_scales / prev_scale).tolist()
+            thresholds[weighted_layers[-1].name] = float(applied_factors[-1])
 
-        # Build dictionary of thresholds for each layer
-        thresholds = {layer: threshold for layer, threshold
-                      in zip(weighted_layers, applied_factors)}
-
-        return PreCompileOutput(thresholds=thresholds)
+            return {'thresholds': thresholds}
+        else:
+            return {'thresholds': {layer.name: float(threshold) for layer, threshold
+                                   in zip(weighted_layers, applied_factors)}}
 
     def post_compile(self, mlg_model):
-        pass
+        # Compensate for per-channel thresholds in weights from each channel
+        if self.per_channel:
+            for layer in mlg_model.layers[1:]:
+                if isinstance(layer.neurons, IFNeurons) and layer.neurons.per_neuron_threshold:
+                    scale_downstream_weights(layer)
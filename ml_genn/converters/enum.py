@@ -5,3 +5,5 @@ class ConverterType(Enum):
     DATA_NORM = 'data-norm'
     SPIKE_NORM = 'spike-norm'
     FEW_SPIKE = 'few-spike'
+    TTFS = 'ttfs'
+    PHASE = 'phase'
@@ -4,17 +4,26 @@ from collections import namedtuple
 
 from ml_genn.layers import FSReluNeurons
 from ml_genn.layers import FSReluInputNeurons
+from ml_genn.converters.activation_stats import calc_activation_stats
+from ml_genn.converters.norm_cache import cached, get_tf_model_key
 
 # Because we want the converter class to be reusable, we don't want the
 # normalisation data to be a member, instead we encapsulate it in a tuple
 PreCompileOutput = namedtuple('PreCompileOutput', ['max_activations', 'max_input'])
 
 class FewSpike(object):
-    def __init__(self, K=10, alpha=25, signed_input=False, norm_data=None):
+    def __init__(self, K=10, alpha=25, signed_input=False, norm_data=None, cache_dir=None,
+                 norm_batch_size=256, percentile=None):
         self.K = K
         self.alpha = alpha
         self.signed_input = signed_input
         self.norm_data = norm_data
+        self.cache_dir = cache_dir
+        self.norm_batch_size = norm_batch_size
+
+        # If percentile is set, optimise alpha for this percentile of
+        # each layer's activations rather than the maximum activation
+        self.percentile = percentile
 
     def validate_tf_layer(self, tf_layer):
         if tf_layer.activation != tf.keras.activations.relu:
@@ -41,30 +50,45 @@ class FewSpike(object):
             weighted_layers = [l for l in tf_model.layers
                                if len(l.get_weights()) > 0]
 
-            # Get output functions for weighted layers.
-            get_outputs = tf.keras.backend.function(
-                tf_model.inputs, [l.output for l in weighted_layers])
-
-            # Get output given input data.
-            outputs = get_outputs(self.norm_data)
+            # Calculate maximum activations, reading them from cache if possible
+            results = cached(self.cache_dir,
+                             lambda: get_tf_model_key('few-spike', tf_model, self.norm_data,
+                                                      signed_input=self.signed_input,
+                                                      percentile=self.percentile),
+                             lambda: self._calc_max_activations(weighted_layers, tf_model))
 
             # Build dictionary of maximum activation in each layer
-            max_activations = {l: np.max(out)
-                               for l, out in zip(weighted_layers, outputs)}
-
-            # Use input data range to directly set maximum input
-            if self.signed_input:
-                max_input = np.amax(np.abs(self.norm_data))
-            else:
-                max_input = np.amax(self.norm_data)
+            max_activations = {l: results['max_activations'][l.name]
+                               for l in weighted_layers}
 
             # Return results of normalisation in tuple
             return PreCompileOutput(max_activations=max_activations,
-                                    max_input=max_input)
+                                    max_input=results['max_input'])
 
         # Otherwise, return empty normalisation output tuple
         else:
             return PreCompileOutput(max_activations={}, max_input=None)
     
+    def _calc_max_activations(self, weighted_layers, tf_model):
+        # Stream input data through model to get statistics of each layer's activations
+        stats = calc_activation_stats(tf_model, weighted_layers, self.norm_data,
+                                      batch_size=self.norm_batch_size)
+
+        # Use input data range to directly set maximum input
+        if self.signed_input:
+            max_input = max(np.amax(np.abs(x)) for x in self.norm_data)
+        else:
+            max_input = max(np.amax(x) for x in self.norm_data)
+
+        # Find the maximum (or percentile) activation in each layer
+        if self.percentile is None:
+            max_activations = {l.name: stats[l.name].max for l in weighted_layers}
+        else:
+            max_activations = {l.name: stats[l.name].percentile(self.percentile)
+                               for l in weighted_layers}
+
+        return {'max_activations': max_activations,
+                'max_input': float(max_input)}
+
     def post_compile(self, mlg_model):
         pass
@@ -0,0 +1,86 @@
+"""On-disk cache of converter normalisation results
+
+Normalisation results (thresholds, maximum activations etc.) are stored
+as small JSON files named by a hash of everything they depend on: the
+model architecture and weights, the normalisation data and the converter
+parameters. Converting a known model with the same data therefore skips
+normalisation entirely.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from ml_genn.build_cache import describe_model
+
+
+def _hash_arrays(key_hash, arrays):
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        key_hash.update('{}{}'.format(a.dtype.str, a.shape).encode())
+        key_hash.update(a.data)
+
+
+def get_tf_model_key(converter_name, tf_model, norm_data, **params):
+    """Calculate cache key of normalising a TensorFlow model"""
+    key_hash = hashlib.sha256()
+    key_hash.update(converter_name.encode())
+    key_hash.update(tf_model.to_json().encode())
+    _hash_arrays(key_hash, tf_model.get_weights())
+    _hash_arrays(key_hash, norm_data)
+    key_hash.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return '{}_{}'.format(converter_name, key_hash.hexdigest()[:32])
+
+
+def get_mlg_model_key(converter_name, mlg_model, norm_data, **params):
+    """Calculate cache key of normalising an ML GeNN model"""
+    key_hash = hashlib.sha256()
+    key_hash.update(converter_name.encode())
+    key_hash.update(json.dumps(describe_model(mlg_model), sort_keys=True, default=str).encode())
+    for layer in mlg_model.layers:
+        _hash_arrays(key_hash, layer.get_weights() if hasattr(layer, 'get_weights') else [])
+    _hash_arrays(key_hash, norm_data)
+    key_hash.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return '{}_{}'.format(converter_name, key_hash.hexdigest()[:32])
+
+
+def cached(cache_dir, get_key, calc_results):
+    """Get normalisation results from cache, calculating and caching them if required
+
+    Args:
+    cache_dir     --  cache directory or None to always calculate results
+    get_key       --  function returning cache key of results
+    calc_results  --  function calculating results as a JSON-serialisable dictionary
+    """
+
+    if cache_dir is None:
+        return calc_results()
+
+    # If results are cached, return them
+    path = os.path.join(cache_dir, get_key() + '.json')
+    try:
+        with open(path, 'r') as cache_file:
+            print('using cached normalisation results from {}'.format(path))
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        pass
+
+    # Otherwise, calculate them
+    results = calc_results()
+
+    # Write results to temporary file and atomically move it into place
+    # so concurrent conversions never read partially written results
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            json.dump(results, tmp_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    return results
@@ -1,14 +1,17 @@
 import tensorflow as tf
 
 from ml_genn.layers import InputType
+from ml_genn.layers import ResetMode
 from ml_genn.layers import IFNeurons
 from ml_genn.layers import SpikeInputNeurons
 from ml_genn.layers import PoissonInputNeurons
 from ml_genn.layers import IFInputNeurons
 
 class Simple(object):
-    def __init__(self, input_type=InputType.POISSON):
+    def __init__(self, input_type=InputType.POISSON, reset=ResetMode.ZERO, max_spikes=1):
         self.input_type = InputType(input_type)
+        self.reset = ResetMode(reset)
+        self.max_spikes = max_spikes
 
     def validate_tf_layer(self, tf_layer):
         if tf_layer.activation != tf.keras.activations.relu:
@@ -26,10 +29,10 @@ class Simple(object):
         elif self.input_type == InputType.POISSON_SIGNED:
             return PoissonInputNeurons(signed_spikes=True)
         elif self.input_type == InputType.IF:
-            return IFInputNeurons()
+            return IFInputNeurons(reset=self.reset)
 
     def create_neurons(self, tf_layer, pre_compile_output):
-        return IFNeurons(threshold=1.0)
+        return IFNeurons(threshold=1.0, reset=self.reset, max_spikes=self.max_spikes)
 
     def pre_compile(self, tf_model):
         pass
@@ -1,18 +1,61 @@
 import tensorflow as tf
 import numpy as np
+from collections import namedtuple
 from tqdm import tqdm
 
 from ml_genn.layers import InputType
+from ml_genn.layers import ResetMode
 from ml_genn.layers import IFNeurons
 from ml_genn.layers import SpikeInputNeurons
 from ml_genn.layers import PoissonInputNeurons
 from ml_genn.layers import IFInputNeurons
+from ml_genn.converters.channel_norm import tile_channels, scale_downstream_weights
+from ml_genn.converters.norm_cache import cached, get_mlg_model_key
+
+# Because we want the converter class to be reusable, we don't want the
+# output layer to be a member, instead we encapsulate it in a tuple
+PreCompileOutput = namedtuple('PreCompileOutput', ['output_layer'])
 
 class SpikeNorm(object):
-    def __init__(self, norm_data, norm_time, input_type=InputType.POISSON):
+    def __init__(self, norm_data, norm_time, input_type=InputType.POISSON,
+                 cache_dir=None, patience=None, per_channel=False, reset=ResetMode.ZERO,
+                 max_spikes=1):
+        """Create a converter which calibrates IF thresholds by simulating the converted model
+
+        Args:
+        norm_data    --  list of data for each input layer to calibrate thresholds with
+        norm_time    --  presentation time of each batch of norm data (msec)
+
+        Keyword args:
+        input_type   --  type of input neurons (default: 'poisson')
+        cache_dir    --  directory to cache calibrated thresholds in (default: None)
+        patience     --  number of batches without the maximum input of a layer increasing
+                         after which its threshold is fixed and the next layer is calibrated
+                         with the next batch (default: None, meaning every layer is calibrated
+                         with all norm data, which is slowest but gives exact thresholds)
+        per_channel  --  give each channel of each layer except the output layer its own
+                         threshold (default: False)
+        reset        --  how IF neurons reset after spiking (default: 'zero')
+        max_spikes   --  maximum number of spikes IF neurons emit per timestep (default: 1)
+
+        With patience, calibration takes fewer batch presentations but each layer's
+        threshold is the maximum input over only the batches it saw. Thresholds can
+        therefore be lower than exact ones, which increases firing rates, and the amount
+        depends on how representative those batches are of the norm data.
+        """
         self.norm_data = norm_data
         self.norm_time = norm_time
         self.input_type = InputType(input_type)
+        self.reset = ResetMode(reset)
+        self.max_spikes = max_spikes
+        self.cache_dir = cache_dir
+
+        # If patience is set, a layer's threshold is fixed once it has not
+        # increased for this many batches, rather than after all norm data
+        self.patience = patience
+
+        # If per_channel is set, each channel of each layer except the output layer gets its own threshold
+        self.per_channel = per_channel
 
     def validate_tf_layer(self, tf_layer):
         if tf_layer.activation != tf.keras.activations.relu:
@@ -30,58 +73,133 @@ class SpikeNorm(object):
         elif self.input_type == InputType.POISSON_SIGNED:
             return PoissonInputNeurons(signed_spikes=True)
         elif self.input_type == InputType.IF:
-            return IFInputNeurons()
+            return IFInputNeurons(reset=self.reset)
 
     def create_neurons(self, tf_layer, pre_compile_output):
-        return IFNeurons(threshold=1.0)
+        # **NOTE** neurons are built with maximum input tracking so they can be calibrated
+        # after compilation. Tracking is switched off in post_compile but each neuron
+        # still stores Vmax and checks whether tracking is enabled every timestep
+        # **NOTE** output layer has no downstream weights to compensate per-channel thresholds
+        # in so it keeps a layer-wise threshold, otherwise its spike counts would not be
+        # comparable between classes
+        if self.per_channel and tf_layer is not pre_compile_output.output_layer:
+            return IFNeurons(threshold=np.ones(np.prod(tf_layer.output_shape[1:])), track_max=True,
+                             reset=self.reset, max_spikes=self.max_spikes)
+        else:
+            return IFNeurons(threshold=1.0, track_max=True, reset=self.reset,
+                             max_spikes=self.max_spikes)
 
     def pre_compile(self, tf_model):
-        pass
+        # Get final weighted layer which becomes the output layer
+        weighted_layers = [l for l in tf_model.layers
+                           if len(l.get_weights()) > 0]
+
+        return PreCompileOutput(output_layer=weighted_layers[-1])
 
     def post_compile(self, mlg_model):
+        # Calculate thresholds, reading them from cache if possible
+        results = cached(self.cache_dir,
+                         lambda: get_mlg_model_key('spike-norm', mlg_model, self.norm_data,
+                                                   norm_time=self.norm_time, dt=mlg_model.g_model.dT,
+                                                   patience=self.patience, per_channel=self.per_channel),
+                         lambda: self._calc_thresholds(mlg_model))
+
+        # Set thresholds and stop tracking maximum input now it's no longer needed
+        for layer in self._get_if_layers(mlg_model):
+            self._set_threshold(layer, results['thresholds'][layer.name])
+            layer.neurons.set_track_max(False)
+
+    def _get_if_layers(self, mlg_model):
+        # Get layers with IF neurons (i.e. excluding any non-spiking output layer)
+        return [l for l in mlg_model.layers[1:] if isinstance(l.neurons, IFNeurons)]
+
+    def _set_threshold(self, layer, threshold):
+        # Set threshold and, if thresholds are per-channel, compensate for
+        # them in weights from each channel so next layer's input is unchanged
+        if layer.neurons.per_neuron_threshold:
+            layer.neurons.set_threshold(tile_channels(threshold, layer.shape))
+            scale_downstream_weights(layer)
+        else:
+            layer.neurons.set_threshold(threshold)
+
+    def _calc_thresholds(self, mlg_model):
         g_model = mlg_model.g_model
+        layers = self._get_if_layers(mlg_model)
+        thresholds = {}
         n_samples = self.norm_data[0].shape[0]
+        n_timesteps = mlg_model.calc_timesteps(self.norm_time)
+        batch_starts = list(range(0, n_samples, g_model.batch_size))
 
-        # Set layer thresholds high initially
-        for layer in mlg_model.layers[1:]:
+        # Set layer thresholds high initially and track maximum input
+        for layer in layers:
             layer.neurons.set_threshold(np.inf)
-
-        # For each weighted layer
-        for layer in mlg_model.layers[1:]:
-            threshold = np.float64(0.0)
-
-            # For each sample presentation
-            progress = tqdm(total=n_samples)
-            for batch_start in range(0, n_samples, g_model.batch_size):
+            layer.neurons.set_track_max(True)
+
+        # Take copy of weights as calibrating per-channel thresholds scales them
+        # **NOTE** this includes weights to any non-spiking output layer
+        if self.per_channel:
+            weighted_layers = mlg_model.layers[1:]
+            weights = [layer.get_weights() for layer in weighted_layers]
+
+        # Calibrate each weighted layer in turn, moving on to the next layer with
+        # the next batch as soon as this layer's threshold has converged and
+        # wrapping around the norm data so each layer sees every batch at most once
+        # **NOTE** without patience, each layer sees all norm data so thresholds are exact
+        batch_i = 0
+        n_batches = 0
+        progress = tqdm(total=len(layers))
+        for layer in layers:
+            per_channel = layer.neurons.per_neuron_threshold
+            threshold = np.zeros(layer.shape[-1] if per_channel else 1)
+            stable_batches = 0
+
+            for b in range(len(batch_starts)):
+                batch_start = batch_starts[batch_i]
                 batch_end = min(batch_start + g_model.batch_size, n_samples)
                 batch_n = batch_end - batch_start
                 batch_data = [x[batch_start:batch_end]
                               for x in self.norm_data]
+                batch_i = (batch_i + 1) % len(batch_starts)
+                n_batches += 1
 
                 # Set new input
                 mlg_model.reset()
                 mlg_model.set_input_batch(batch_data)
 
-                # Main simulation loop
-                while g_model.t < self.norm_time:
-                    # Step time
-                    mlg_model.step_time()
+                # Simulate batch, tracking maximum activation on device
+                mlg_model.step_time(n_timesteps)
 
-                    # Get maximum activation
-                    nrn = layer.neurons.nrn
-                    nrn.pull_var_from_device('Vmem')
-                    if nrn.vars['Vmem'].view.ndim == 1:
-                        output_view = nrn.vars['Vmem'].view[np.newaxis]
-                    else:
-                        output_view = nrn.vars['Vmem'].view[:batch_n]
-                    threshold = np.max([threshold, output_view.max()])
-                    output_view[:] = np.float64(0.0)
-                    nrn.push_var_to_device('Vmem')
+                # Get maximum activation (of each channel)
+                max_input = layer.neurons.get_max_input(batch_n)
+                batch_max = max_input.reshape(-1, threshold.shape[0]).max(axis=0)
+                if np.any(batch_max > threshold):
+                    threshold = np.maximum(threshold, batch_max)
+                    stable_batches = 0
+                else:
+                    stable_batches += 1
 
-                progress.update(batch_n)
-
-            progress.close()
+                # Stop calibrating layer if threshold has converged
+                if self.patience is not None and stable_batches >= self.patience:
+                    break
 
             # Update this layer's threshold
-            print('layer <{}> threshold: {}'.format(layer.name, threshold))
-            layer.neurons.set_threshold(threshold)
+            # **NOTE** channels which never received input get the layer's threshold
+            if per_channel:
+                threshold = np.where(threshold > 0.0, threshold, threshold.max()).tolist()
+            else:
+                threshold = float(threshold[0])
+            progress.write('layer <{}> threshold: {}'.format(layer.name, threshold))
+            progress.update(1)
+            self._set_threshold(layer, threshold)
+            thresholds[layer.name] = threshold
+
+        progress.close()
+
+        # Restore original weights so post_compile can scale them
+        if self.per_channel:
+            for layer, w in zip(weighted_layers, weights):
+                layer.set_weights(w)
+        print('calibrated {} layers in {} batch presentations ({:.2f} passes over norm data)'.format(
+            len(layers), n_batches, n_batches / len(batch_starts)))
+
+        return {'thresholds': thresholds}
@@ -0,0 +1,93 @@
+import numpy as np
+import tensorflow as tf
+from collections import namedtuple
+
+from ml_genn.layers import TTFSNeurons
+from ml_genn.layers import TTFSInputNeurons
+from ml_genn.converters.activation_stats import calc_activation_stats
+from ml_genn.converters.norm_cache import cached, get_tf_model_key
+
+# Because we want the converter class to be reusable, we don't want the
+# normalisation data to be a member, instead we encapsulate it in a tuple
+PreCompileOutput = namedtuple('PreCompileOutput', ['thresholds', 'layer_indices', 'input_scale'])
+
+class TTFS(object):
+    def __init__(self, norm_data, window=64, cache_dir=None, norm_batch_size=256, percentile=None):
+        self.norm_data = norm_data
+        self.window = window
+        self.cache_dir = cache_dir
+        self.norm_batch_size = norm_batch_size
+
+        # If percentile is set, normalise by this percentile of each
+        # layer's activations rather than the maximum activation
+        self.percentile = percentile
+
+    def validate_tf_layer(self, tf_layer):
+        if tf_layer.activation != tf.keras.activations.relu:
+            raise NotImplementedError('{} activation not supported'.format(type(tf_layer.activation)))
+        if tf_layer.use_bias == True:
+            raise NotImplementedError('bias tensors not supported')
+
+    def create_input_neurons(self, pre_compile_output):
+        return TTFSInputNeurons(window=self.window, scale=pre_compile_output.input_scale)
+
+    def create_neurons(self, tf_layer, pre_compile_output):
+        return TTFSNeurons(window=self.window,
+                           layer_index=pre_compile_output.layer_indices[tf_layer],
+                           threshold=pre_compile_output.thresholds[tf_layer])
+
+    def calc_presentation_time(self, tf_model, dt=1.0):
+        """Calculate time required for each weighted layer of model to integrate its input"""
+        num_weighted_layers = len([l for l in tf_model.layers
+                                   if len(l.get_weights()) > 0])
+        return ((num_weighted_layers * self.window) + 1) * dt
+
+    def pre_compile(self, tf_model):
+        # Get weighted layers
+        weighted_layers = [l for l in tf_model.layers
+                           if len(l.get_weights()) > 0]
+
+        # Calculate thresholds, reading them from cache if possible
+        results = cached(self.cache_dir,
+                         lambda: get_tf_model_key('ttfs', tf_model, self.norm_data,
+                                                  percentile=self.percentile),
+                         lambda: self._calc_thresholds(tf_model, weighted_layers))
+
+        for layer in weighted_layers:
+            print('layer <{}> threshold: {}'.format(layer.name, results['thresholds'][layer.name]))
+
+        # Build dictionaries of thresholds and indices of each layer
+        # **NOTE** layer i integrates its input during the i-th window of the presentation
+        thresholds = {layer: results['thresholds'][layer.name]
+                      for layer in weighted_layers}
+        layer_indices = {layer: i + 1 for i, layer in enumerate(weighted_layers)}
+
+        return PreCompileOutput(thresholds=thresholds, layer_indices=layer_indices,
+                                input_scale=results['input_scale'])
+
+    def _calc_thresholds(self, tf_model, weighted_layers):
+        # Stream input data through model to get statistics of each layer's activations
+        stats = calc_activation_stats(tf_model, weighted_layers, self.norm_data,
+                                      batch_size=self.norm_batch_size)
+
+        # Find the maximum (or percentile) activation in each layer, which is encoded
+        # by a spike at the start of a window, and the maximum input
+        if self.percentile is None:
+            scale_factors = np.array([stats[layer.name].max for layer in weighted_layers],
+                                     dtype=np.float64)
+        else:
+            scale_factors = np.array([stats[layer.name].percentile(self.percentile)
+                                      for layer in weighted_layers], dtype=np.float64)
+        input_scale = float(max(np.amax(x) for x in self.norm_data))
+
+        # Thresholds are the ratio of each layer's scale factor to the previous layer's
+        applied_factors = np.empty(scale_factors.shape, dtype=np.float64)
+        applied_factors[0] = scale_factors[0] / input_scale
+        applied_factors[1:] = scale_factors[1:] / scale_factors[:-1]
+
+        return {'thresholds': {layer.name: float(threshold) for layer, threshold
+                               in zip(weighted_layers, applied_factors)},
+                'input_scale': input_scale}
+
+    def post_compile(self, mlg_model):
+        pass
@@ -1,15 +1,21 @@
 from ml_genn.layers.enum import InputType
 from ml_genn.layers.enum import ConnectivityType
 from ml_genn.layers.enum import PadMode
+from ml_genn.layers.enum import ResetMode
 
 from ml_genn.layers.neurons import Neurons
 from ml_genn.layers.fs_neurons import FSReluNeurons
 from ml_genn.layers.if_neurons import IFNeurons
+from ml_genn.layers.integrator_neurons import IntegratorNeurons
+from ml_genn.layers.ttfs_neurons import TTFSNeurons
+from ml_genn.layers.phase_neurons import PhaseNeurons
 from ml_genn.layers.input_neurons import InputNeurons
 from ml_genn.layers.spike_input_neurons import SpikeInputNeurons
 from ml_genn.layers.poisson_input_neurons import PoissonInputNeurons
 from ml_genn.layers.if_input_neurons import IFInputNeurons
 from ml_genn.layers.fs_input_neurons import FSReluInputNeurons
+from ml_genn.layers.ttfs_input_neurons import TTFSInputNeurons
+from ml_genn.layers.phase_input_neurons import PhaseInputNeurons
 
 from ml_genn.layers.dense_synapses import DenseSynapses
 from ml_genn.layers.conv2d_synapses import Conv2DSynapses
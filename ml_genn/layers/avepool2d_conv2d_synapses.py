@@ -8,7 +8,7 @@ from pygenn.genn_wrapper.StlContainers import UnsignedIntVector
 from ml_genn.layers import ConnectivityType, PadMode
 
 from ml_genn.layers.base_synapses import BaseSynapses
-from ml_genn.layers.weight_update_models import signed_static_pulse
+from ml_genn.layers.weight_update_models import get_wu_model
 
 avepool2d_conv2d_init = create_custom_sparse_connect_init_snippet_class(
     'avepool2d_conv2d',
@@ -189,9 +189,47 @@ class AvePool2DConv2DSynapses(BaseSynapses):
 
         conn = ('PROCEDURAL_PROCEDURALG' if self.connectivity_type == ConnectivityType.PROCEDURAL
                 else 'SPARSE_INDIVIDUALG')
-        wu_model = signed_static_pulse if self.source().neurons.signed_spikes else 'StaticPulse'
+        wu_model = get_wu_model(self.source().neurons)
         wu_var = {'g': init_var('Kernel', {})}
         wu_var_egp = {'g': {'kernel': self.weights.flatten() / (pool_kh * pool_kw)}}
 
         super(AvePool2DConv2DSynapses, self).compile(mlg_model, name, conn, 0, wu_model, {}, wu_var,
                                                      {}, {}, 'DeltaCurr', {}, {}, conn_init, wu_var_egp)
+
+    def push_weights(self):
+        pool_kh, pool_kw = self.pool_size
+        self.push_weights_egp('kernel', self.weights.flatten() / (pool_kh * pool_kw),
+                              self.connectivity_type == ConnectivityType.PROCEDURAL, True)
+
+    def calc_g(self, kernel, pre_inds, post_inds):
+        pool_kh, pool_kw = self.pool_size
+        pool_sh, pool_sw = self.pool_strides
+        pool_ih, pool_iw, pool_ic = self.source().shape
+        if self.pool_padding == PadMode.VALID:
+            pool_padh = 0
+            pool_padw = 0
+        elif self.pool_padding == PadMode.SAME:
+            pool_padh = (pool_kh - 1) // 2
+            pool_padw = (pool_kw - 1) // 2
+
+        conv_kh, conv_kw = self.conv_size
+        conv_sh, conv_sw = self.conv_strides
+        conv_ih, conv_iw, conv_ic = self.pool_output_shape
+        conv_oh, conv_ow, conv_oc = self.target().shape
+        if self.conv_padding == PadMode.VALID:
+            conv_padh = 0
+            conv_padw = 0
+        elif self.conv_padding == PadMode.SAME:
+            conv_padh = (conv_kh - 1) // 2
+            conv_padw = (conv_kw - 1) // 2
+
+        # Calculate kernel index of each synapse in the same way as avepool2d_conv2d_init
+        pool_in_row, pool_in_col, pool_in_chan = np.unravel_index(pre_inds, (pool_ih, pool_iw, pool_ic))
+        pool_out_row = (pool_in_row + pool_padh) // pool_sh
+        pool_out_col = (pool_in_col + pool_padw) // pool_sw
+        out_row, out_col, out_chan = np.unravel_index(post_inds, (conv_oh, conv_ow, conv_oc))
+        kern_row = pool_out_row - ((out_row * conv_sh) - conv_padh)
+        kern_col = pool_out_col - ((out_col * conv_sw) - conv_padw)
+
+        return kernel[np.ravel_multi_index((kern_row, kern_col, pool_in_chan, out_chan),
+                                           (conv_kh, conv_kw, conv_ic, conv_oc))]
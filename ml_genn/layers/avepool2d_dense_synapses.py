@@ -6,7 +6,7 @@ from pygenn.genn_wrapper import NO_DELAY
 
 from ml_genn.layers import ConnectivityType, PadMode
 from ml_genn.layers.base_synapses import BaseSynapses
-from ml_genn.layers.weight_update_models import signed_static_pulse
+from ml_genn.layers.weight_update_models import get_wu_model
 
 avepool2d_dense_init = create_custom_init_var_snippet_class(
     'avepool2d_dense_big_pool',
@@ -129,9 +129,44 @@ class AvePool2DDenseSynapses(BaseSynapses):
 
         conn = ('DENSE_PROCEDURALG' if self.connectivity_type == ConnectivityType.PROCEDURAL 
                 else 'DENSE_INDIVIDUALG')
-        wu_model = signed_static_pulse if self.source().neurons.signed_spikes else 'StaticPulse'
+        wu_model = get_wu_model(self.source().neurons)
         wu_var = {'g': wu_var_init}
         wu_var_egp = {'g': {'weights': self.weights.flatten()}}
 
         super(AvePool2DDenseSynapses, self).compile(mlg_model, name, conn, 0, wu_model, {}, wu_var,
                                                     {}, {}, 'DeltaCurr', {}, {}, None, wu_var_egp)
+
+    def push_weights(self):
+        self.push_weights_egp('weights', self.weights.flatten(),
+                              self.connectivity_type == ConnectivityType.PROCEDURAL, False)
+
+    def calc_g(self, weights, pre_inds, post_inds):
+        pool_kh, pool_kw = self.pool_size
+        pool_sh, pool_sw = self.pool_strides
+        pool_ih, pool_iw, pool_ic = self.source().shape
+        if self.pool_padding == PadMode.VALID:
+            pool_padh = 0
+            pool_padw = 0
+        elif self.pool_padding == PadMode.SAME:
+            pool_padh = (pool_kh - 1) // 2
+            pool_padw = (pool_kw - 1) // 2
+
+        dense_ih, dense_iw, dense_ic = self.pool_output_shape
+
+        # Calculate weight of each synapse in the same way as avepool2d_dense_init
+        pool_in_row, pool_in_col, pool_in_chan = np.unravel_index(pre_inds, (pool_ih, pool_iw, pool_ic))
+        pool_out_row = (pool_in_row + pool_padh) // pool_sh
+        pool_stride_row = pool_out_row * pool_sh - pool_padh
+        pool_crop_kh = np.minimum(pool_stride_row + pool_kh, pool_ih) - np.maximum(pool_stride_row, 0)
+        pool_out_col = (pool_in_col + pool_padw) // pool_sw
+        pool_stride_col = pool_out_col * pool_sw - pool_padw
+        pool_crop_kw = np.minimum(pool_stride_col + pool_kw, pool_iw) - np.maximum(pool_stride_col, 0)
+
+        # Pool inputs which don't fall within any pool window have no weight
+        valid = (pool_in_row < (pool_stride_row + pool_kh)) & (pool_in_col < (pool_stride_col + pool_kw))
+        dense_in_unit = pool_out_row * (dense_iw * dense_ic) + pool_out_col * dense_ic + pool_in_chan
+
+        g = np.zeros(len(pre_inds))
+        g[valid] = (weights[dense_in_unit[valid] * self.units + post_inds[valid]]
+                    / (pool_crop_kh[valid] * pool_crop_kw[valid]))
+        return g
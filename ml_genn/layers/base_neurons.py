@@ -1,10 +1,26 @@
 import numpy as np
+from pygenn.genn_model import create_custom_custom_update_class, create_var_ref
+
+# Custom update to flag neurons of batch lanes to restart, which they do on
+# their next timestep in the same way as at t = 0, resetting their state and
+# discarding input from spikes of the previous presentation still in flight
+lane_reset_model = create_custom_custom_update_class(
+    'lane_reset',
+    var_refs=[('Restart', 'unsigned int')],
+    extra_global_params=[('resetLane', 'unsigned int*')],
+    update_code='''
+    if ($(resetLane)[$(batch)]) {
+        $(Restart) = 1;
+    }
+    ''')
 
 class BaseNeurons(object):
 
     def __init__(self):
         self.signed_spikes = False
+        self.graded_spikes = False
         self.nrn = None
+        self.lane_reset = None
 
     def compile(self, mlg_model, layer, model, params, vars, egp):
         name = '{}_nrn'.format(layer.name)
@@ -14,3 +30,21 @@ class BaseNeurons(object):
             name, n, model, params, vars)
         for p in egp:
             self.nrn.set_extra_global_param(p, egp[p])
+
+    def compile_lane_reset(self, mlg_model, layer):
+        # If model uses continuous batching, add custom update to reset state of individual
+        # batch lanes (neuron models must then have been created with a 'Restart' variable)
+        if mlg_model.continuous_batching:
+            self.lane_reset = mlg_model.g_model.add_custom_update(
+                '{}_lane_reset'.format(layer.name), 'ResetLanes', lane_reset_model, {}, {},
+                {'Restart': create_var_ref(self.nrn, 'Restart')})
+            self.lane_reset.set_extra_global_param(
+                'resetLane', np.zeros(mlg_model.g_model.batch_size, dtype=np.uint32))
+
+    def set_reset_lanes(self, lanes):
+        # Flag lanes to reset when the 'ResetLanes' custom update is next run
+        if self.lane_reset is not None:
+            reset_view = self.lane_reset.extra_global_params['resetLane'].view
+            reset_view[:] = 0
+            reset_view[lanes] = 1
+            self.lane_reset.push_extra_global_param_to_device('resetLane', reset_view.shape[0])
@@ -1,3 +1,4 @@
+import numpy as np
 from weakref import ref
 from six import iteritems
 
@@ -18,6 +19,49 @@ class BaseSynapses(object):
     def set_weights(self, weights):
         self.weights[:] = weights
 
+        # If synapses have been compiled, update weights on device
+        if self.syn is not None:
+            self.push_weights()
+
+    def push_weights(self):
+        raise NotImplementedError('updating weights of compiled synapses is not supported')
+
+    def push_weights_egp(self, egp, values, procedural, sparse):
+        # Update kernel weights extra global parameter used to initialise 'g'
+        egp_view = self.syn.vars['g'].extra_global_params[egp].view
+        egp_view[:] = values
+        self.syn.push_extra_global_param_to_device(egp + 'g', len(egp_view))
+
+        # Procedural weights are read from the kernel on the fly, otherwise calculate
+        # 'g' of each synapse on the host in the same way as it was initialised
+        # **NOTE** re-running the GeNN model's initialisation instead would reset every variable in the model
+        if not procedural:
+            g_inds, pre_inds, post_inds = self.get_synapse_inds(sparse)
+            self.syn.vars['g'].view[g_inds] = self.calc_g(values, pre_inds, post_inds)
+            self.syn.push_var_to_device('g')
+
+    def calc_g(self, values, pre_inds, post_inds):
+        raise NotImplementedError('calculating weights of individual synapses is not supported')
+
+    def get_synapse_inds(self, sparse):
+        # Get index into 'g' and pre and postsynaptic neuron index of each synapse
+        num_pre = int(np.prod(self.source().shape))
+        num_post = int(np.prod(self.target().shape))
+        if sparse:
+            # Download connectivity built on device
+            self.syn.pull_connectivity_from_device()
+            pre_inds = self.syn.get_sparse_pre_inds()
+            post_inds = self.syn.get_sparse_post_inds()
+
+            # Synapses are stored in rows of max_row_length so find position of each synapse in its row
+            row_starts = np.searchsorted(pre_inds, np.arange(num_pre))
+            row_pos = np.arange(len(pre_inds)) - row_starts[pre_inds]
+            return pre_inds.astype(int) * self.syn.max_row_length + row_pos, pre_inds, post_inds
+        else:
+            pre_inds = np.repeat(np.arange(num_pre), num_post)
+            post_inds = np.tile(np.arange(num_post), num_pre)
+            return np.arange(num_pre * num_post), pre_inds, post_inds
+
     def get_weights(self):
         return self.weights.copy()
 
@@ -8,7 +8,7 @@ from pygenn.genn_wrapper.StlContainers import UnsignedIntVector
 
 from ml_genn.layers import ConnectivityType, PadMode
 from ml_genn.layers.base_synapses import BaseSynapses
-from ml_genn.layers.weight_update_models import signed_static_pulse
+from ml_genn.layers.weight_update_models import get_wu_model
 
 conv2d_init = create_custom_sparse_connect_init_snippet_class(
     'conv2d',
@@ -131,9 +131,34 @@ class Conv2DSynapses(BaseSynapses):
 
         conn = ('PROCEDURAL_PROCEDURALG' if self.connectivity_type == ConnectivityType.PROCEDURAL
                 else 'SPARSE_INDIVIDUALG')
-        wu_model = signed_static_pulse if self.source().neurons.signed_spikes else 'StaticPulse'
+        wu_model = get_wu_model(self.source().neurons)
         wu_var = {'g': init_var('Kernel', {})}
         wu_var_egp = {'g': {'kernel': self.weights.flatten()}}
 
         super(Conv2DSynapses, self).compile(mlg_model, name, conn, 0, wu_model, {}, wu_var,
                                             {}, {}, 'DeltaCurr', {}, {}, conn_init, wu_var_egp)
+
+    def push_weights(self):
+        self.push_weights_egp('kernel', self.weights.flatten(),
+                              self.connectivity_type == ConnectivityType.PROCEDURAL, True)
+
+    def calc_g(self, kernel, pre_inds, post_inds):
+        conv_kh, conv_kw = self.conv_size
+        conv_sh, conv_sw = self.conv_strides
+        conv_ih, conv_iw, conv_ic = self.source().shape
+        conv_oh, conv_ow, conv_oc = self.target().shape
+        if self.conv_padding == PadMode.VALID:
+            conv_padh = 0
+            conv_padw = 0
+        elif self.conv_padding == PadMode.SAME:
+            conv_padh = (conv_kh - 1) // 2
+            conv_padw = (conv_kw - 1) // 2
+
+        # Calculate kernel index of each synapse in the same way as conv2d_init
+        in_row, in_col, in_chan = np.unravel_index(pre_inds, (conv_ih, conv_iw, conv_ic))
+        out_row, out_col, out_chan = np.unravel_index(post_inds, (conv_oh, conv_ow, conv_oc))
+        kern_row = in_row - ((out_row * conv_sh) - conv_padh)
+        kern_col = in_col - ((out_col * conv_sw) - conv_padw)
+
+        return kernel[np.ravel_multi_index((kern_row, kern_col, in_chan, out_chan),
+                                           (conv_kh, conv_kw, conv_ic, conv_oc))]
@@ -2,7 +2,7 @@ import numpy as np
 from pygenn.genn_wrapper import NO_DELAY
 
 from ml_genn.layers.base_synapses import BaseSynapses
-from ml_genn.layers.weight_update_models import signed_static_pulse
+from ml_genn.layers.weight_update_models import get_wu_model
 
 class DenseSynapses(BaseSynapses):
 
@@ -24,8 +24,15 @@ class DenseSynapses(BaseSynapses):
 
     def compile(self, mlg_model, name):
         conn = 'DENSE_INDIVIDUALG'
-        wu_model = signed_static_pulse if self.source().neurons.signed_spikes else 'StaticPulse'
+        wu_model = get_wu_model(self.source().neurons)
         wu_var = {'g': self.weights.flatten()}
 
         super(DenseSynapses, self).compile(mlg_model, name, conn, 0, wu_model, {}, wu_var,
                                            {}, {}, 'DeltaCurr', {}, {}, None, {})
+
+    def push_weights(self):
+        # Also update values 'g' is initialised from so they're kept if the model is reinitialised
+        g = self.syn.vars['g']
+        g.values[:] = self.weights.flatten()
+        g.view[:] = g.values
+        self.syn.push_var_to_device('g')
@@ -14,3 +14,7 @@ class ConnectivityType(Enum):
 class PadMode(Enum):
     VALID = 'valid'
     SAME = 'same'
+
+class ResetMode(Enum):
+    ZERO = 'zero'
+    SUBTRACT = 'subtract'
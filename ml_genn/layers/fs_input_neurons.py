@@ -1,12 +1,11 @@
 from pygenn.genn_model import create_dpf_class, create_custom_neuron_class
-from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY_DUPLICATE
 from ml_genn.layers.input_neurons import InputNeurons
 
 fs_relu_input_model = create_custom_neuron_class(
     'fs_relu_input',
     param_names=['K', 'alpha'],
     derived_params=[("scale", create_dpf_class(lambda pars, dt: pars[1] * 2**(-pars[0]))())],
-    var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE), ('Vmem', 'scalar')],
+    var_name_types=[('input', 'scalar'), ('Vmem', 'scalar')],
     sim_code='''
     // Convert K to integer
     const int kInt = (int)$(K);
@@ -33,7 +32,7 @@ fs_relu_signed_input_model = create_custom_neuron_class(
     'fs_relu_signed_input',
     param_names=['K', 'alpha'],
     derived_params=[("scale", create_dpf_class(lambda pars, dt: pars[1] * 2**(-pars[0]//2))())],
-    var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE), ('Vmem', 'scalar')],
+    var_name_types=[('input', 'scalar'), ('Vmem', 'scalar')],
     sim_code='''
     // Convert K to integer
     const int halfK = (int)$(K) / 2;
@@ -1,4 +1,3 @@
-import numpy as np
 from pygenn.genn_model import create_dpf_class, create_custom_neuron_class
 from ml_genn.layers.fs_input_neurons import FSReluInputNeurons
 from ml_genn.layers.neurons import Neurons
@@ -82,6 +81,8 @@ fs_relu_upstream_signed_input_model = create_custom_neuron_class(
 
 class FSReluNeurons(Neurons):
     pipelined = True
+    score_var = 'Fx'
+    score_type = 'scalar'
 
     def __init__(self, K=10, alpha=25):
         super(FSReluNeurons, self).__init__()
@@ -145,11 +146,3 @@ class FSReluNeurons(Neurons):
     def set_threshold(self, threshold):
         raise NotImplementedError('FS neurons do not have '
                                   'overridable thresholds')
-
-    def get_predictions(self, batch_n):
-        self.nrn.pull_var_from_device('Fx')
-        if self.nrn.vars['Fx'].view.ndim == 1:
-            output_view = self.nrn.vars['Fx'].view[np.newaxis]
-        else:
-            output_view = self.nrn.vars['Fx'].view[:batch_n]
-        return output_view.argmax(axis=1)
@@ -1,30 +1,52 @@
 from pygenn.genn_model import create_custom_neuron_class
-from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY_DUPLICATE
+from ml_genn.layers import ResetMode
 from ml_genn.layers.input_neurons import InputNeurons
 
-if_input_model = create_custom_neuron_class(
-    'if_input',
-    var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE), ('Vmem', 'scalar')],
-    sim_code='''
-    if ($(t) == 0.0) {
-        // Reset state at t = 0
-        $(Vmem) = 0.0;
-    }
-    $(Vmem) += $(input) * DT;
-    ''',
-    threshold_condition_code='''
-    $(Vmem) >= 1.0
-    ''',
-    reset_code='''
-    $(Vmem) = 0.0;
-    ''',
-    is_auto_refractory_required=False,
-)
+def create_if_input_model(reset=ResetMode.ZERO, lane_reset=False):
+    # Either reset membrane potential to zero after spiking
+    # or subtract threshold, keeping any charge above it
+    if reset == ResetMode.SUBTRACT:
+        reset_vmem_code = '$(Vmem) -= 1.0;'
+    else:
+        reset_vmem_code = '$(Vmem) = 0.0;'
+
+    # If required, also restart individual batch lanes flagged by the 'ResetLanes' custom update
+    var_name_types = [('input', 'scalar'), ('Vmem', 'scalar')]
+    restart_condition = ''
+    if lane_reset:
+        var_name_types.append(('Restart', 'unsigned int'))
+        restart_condition = ' || $(Restart)'
+
+    return create_custom_neuron_class(
+        ('if_input' + ('_subtract' if reset == ResetMode.SUBTRACT else '')
+         + ('_lane_reset' if lane_reset else '')),
+        var_name_types=var_name_types,
+        sim_code='''
+        if ($(t) == 0.0{}) {{
+            // Reset state at t = 0
+            $(Vmem) = 0.0;
+            {}
+        }}
+        $(Vmem) += $(input) * DT;
+        '''.format(restart_condition, '$(Restart) = 0;' if lane_reset else ''),
+        threshold_condition_code='''
+        $(Vmem) >= 1.0
+        ''',
+        reset_code=reset_vmem_code,
+        is_auto_refractory_required=False,
+    )
 
 class IFInputNeurons(InputNeurons):
 
+    def __init__(self, reset=ResetMode.ZERO):
+        super(IFInputNeurons, self).__init__()
+        self.reset = ResetMode(reset)
+
     def compile(self, mlg_model, layer):
-        model = if_input_model
+        model = create_if_input_model(self.reset, mlg_model.continuous_batching)
         vars = {'input': 0.0, 'Vmem': 0.0}
+        if mlg_model.continuous_batching:
+            vars['Restart'] = 0
 
         super(IFInputNeurons, self).compile(mlg_model, layer, model, {}, vars, {})
+        self.compile_lane_reset(mlg_model, layer)
@@ -1,52 +1,164 @@
 import numpy as np
 from pygenn.genn_model import create_custom_neuron_class
+from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY
+from ml_genn.layers import ResetMode
 from ml_genn.layers.neurons import Neurons
 
-if_model = create_custom_neuron_class(
-    'if',
-    var_name_types=[('Vmem', 'scalar'), ('nSpk', 'unsigned int')],
-    extra_global_params=[('Vthr', 'scalar')],
-    sim_code='''
-    if ($(t) == 0.0) {
-        // Reset state at t = 0
-        $(Vmem) = 0.0;
-        $(nSpk) = 0;
-    }
-    $(Vmem) += $(Isyn) * DT;
-    ''',
-    threshold_condition_code='''
-    $(Vmem) >= $(Vthr)
-    ''',
-    reset_code='''
-    $(Vmem) = 0.0;
-    $(nSpk) += 1;
-    ''',
-    is_auto_refractory_required=False,
-)
+def create_if_model(track_max=False, per_neuron_threshold=False, reset=ResetMode.ZERO,
+                    graded_spikes=False, lane_reset=False):
+    # If required, also track the maximum input integrated in a single
+    # timestep by each neuron (used for spike-based threshold normalisation)
+    # while the TrackMax extra global parameter is set
+    var_name_types = [('Vmem', 'scalar'), ('nSpk', 'unsigned int')]
+    extra_global_params = []
+    reset_max_code = ''
+    track_max_code = ''
+    if track_max:
+        var_name_types.append(('Vmax', 'scalar'))
+        extra_global_params.append(('TrackMax', 'unsigned int'))
+        reset_max_code = '$(Vmax) = 0.0;'
+        track_max_code = '''if ($(TrackMax)) {
+                $(Vmax) = fmax($(Vmax), $(Isyn) * DT);
+            }'''
+
+    # Thresholds are either shared by all neurons or a read-only
+    # variable (shared between batch lanes) with one per neuron
+    if per_neuron_threshold:
+        var_name_types.append(('Vthr', 'scalar', VarAccess_READ_ONLY))
+    else:
+        extra_global_params.append(('Vthr', 'scalar'))
+
+    # If required, emit up to MaxSpikes spikes per timestep, with
+    # the number emitted stored in Amp and delivered by synapses
+    param_names = []
+    graded_code = ''
+    if graded_spikes:
+        param_names.append('MaxSpikes')
+        var_name_types.append(('Amp', 'scalar'))
+        graded_code = '$(Amp) = fmin(floor($(Vmem) / $(Vthr)), $(MaxSpikes));'
+
+    # Either reset membrane potential to zero after spiking
+    # or subtract threshold, keeping any charge above it
+    if reset == ResetMode.SUBTRACT:
+        reset_vmem_code = ('$(Vmem) -= $(Amp) * $(Vthr);' if graded_spikes
+                           else '$(Vmem) -= $(Vthr);')
+    else:
+        reset_vmem_code = '$(Vmem) = 0.0;'
+    count_code = '$(nSpk) += (unsigned int)$(Amp);' if graded_spikes else '$(nSpk) += 1;'
+
+    # If required, also restart individual batch lanes flagged by the 'ResetLanes' custom update
+    restart_condition = ''
+    if lane_reset:
+        var_name_types.append(('Restart', 'unsigned int'))
+        restart_condition = ' || $(Restart)'
+
+    return create_custom_neuron_class(
+        ('if' + ('_track_max' if track_max else '') + ('_per_neuron' if per_neuron_threshold else '')
+         + ('_subtract' if reset == ResetMode.SUBTRACT else '') + ('_graded' if graded_spikes else '')
+         + ('_lane_reset' if lane_reset else '')),
+        param_names=param_names,
+        var_name_types=var_name_types,
+        extra_global_params=extra_global_params,
+        sim_code='''
+        if ($(t) == 0.0{}) {{
+            // Reset state at t = 0, discarding input from spikes
+            // emitted on the last timestep of the previous presentation
+            $(Vmem) = 0.0;
+            $(nSpk) = 0;
+            {}
+            {}
+        }}
+        else {{
+            $(Vmem) += $(Isyn) * DT;
+            {}
+        }}
+        {}
+        '''.format(restart_condition, '$(Restart) = 0;' if lane_reset else '',
+                   reset_max_code, track_max_code, graded_code),
+        threshold_condition_code='''
+        $(Vmem) >= $(Vthr)
+        ''',
+        reset_code='''
+        {}
+        {}
+        '''.format(reset_vmem_code, count_code),
+        is_auto_refractory_required=False,
+    )
 
 class IFNeurons(Neurons):
+    score_var = 'nSpk'
+    score_type = 'unsigned int'
 
-    def __init__(self, threshold=1.0):
+    def __init__(self, threshold=1.0, track_max=False, reset=ResetMode.ZERO, max_spikes=1):
         super(IFNeurons, self).__init__()
         self.threshold = threshold
+        self.track_max = track_max
+        self.reset = ResetMode(reset)
+
+        # If max_spikes > 1, neurons can emit several spikes per timestep
+        self.max_spikes = max_spikes
+        self.graded_spikes = max_spikes > 1
+
+        # If an array of thresholds is passed, each neuron has its own threshold
+        self.per_neuron_threshold = np.ndim(threshold) > 0
 
     def compile(self, mlg_model, layer):
-        model = if_model
+        model = create_if_model(self.track_max, self.per_neuron_threshold, self.reset,
+                                self.graded_spikes, mlg_model.continuous_batching)
+        params = {}
         vars = {'Vmem': 0.0, 'nSpk': 0}
-        egp = {'Vthr': self.threshold}
+        if mlg_model.continuous_batching:
+            vars['Restart'] = 0
+        if self.track_max:
+            vars['Vmax'] = 0.0
+        if self.graded_spikes:
+            params['MaxSpikes'] = self.max_spikes
+            vars['Amp'] = 0.0
+        if self.per_neuron_threshold:
+            vars['Vthr'] = self.threshold
+            egp = {}
+        else:
+            egp = {'Vthr': self.threshold}
+        if self.track_max:
+            egp['TrackMax'] = 1
 
-        super(IFNeurons, self).compile(mlg_model, layer, model, {}, vars, egp)
+        super(IFNeurons, self).compile(mlg_model, layer, model, params, vars, egp)
+        self.compile_lane_reset(mlg_model, layer)
 
     def set_threshold(self, threshold):
-        self.threshold = threshold
+        if self.per_neuron_threshold:
+            self.threshold = np.broadcast_to(threshold, np.shape(self.threshold)).copy()
+
+            # Also update values 'Vthr' is initialised from so they're kept if the model is reinitialised
+            if self.nrn is not None:
+                vthr = self.nrn.vars['Vthr']
+                vthr.values[:] = self.threshold
+                vthr.view[:] = self.threshold
+                self.nrn.push_var_to_device('Vthr')
+        elif np.ndim(threshold) > 0:
+            raise ValueError('IF neurons must be created with an array of thresholds '
+                             'to set per-neuron thresholds')
+        else:
+            self.threshold = threshold
+
+            if self.nrn is not None:
+                self.nrn.extra_global_params['Vthr'].view[:] = threshold
+
+    def set_track_max(self, enabled):
+        # Start or stop tracking maximum input so, once it's no longer
+        # needed, neurons only pay for checking whether it's enabled
+        if not self.track_max:
+            raise RuntimeError('IF neurons must be created with track_max=True to track max input')
+
+        self.nrn.extra_global_params['TrackMax'].view[:] = int(enabled)
+
+    def get_max_input(self, batch_n):
+        # Download maximum input integrated in a single timestep since t = 0
+        if not self.track_max:
+            raise RuntimeError('IF neurons must be created with track_max=True to get max input')
 
-        if self.nrn is not None:
-            self.nrn.extra_global_params['Vthr'].view[:] = threshold
-    
-    def get_predictions(self, batch_n):
-        self.nrn.pull_var_from_device('nSpk')
-        if self.nrn.vars['nSpk'].view.ndim == 1:
-            output_view = self.nrn.vars['nSpk'].view[np.newaxis]
+        self.nrn.pull_var_from_device('Vmax')
+        if self.nrn.vars['Vmax'].view.ndim == 1:
+            return self.nrn.vars['Vmax'].view[np.newaxis]
         else:
-            output_view = self.nrn.vars['nSpk'].view[:batch_n]
-        return output_view.argmax(axis=1)
\ No newline at end of file
+            return self.nrn.vars['Vmax'].view[:batch_n]
@@ -1,9 +1,29 @@
 import numpy as np
+from pygenn.genn_model import create_custom_custom_update_class, create_var_ref
 
 from ml_genn.layers.base_layer import BaseLayer
 from ml_genn.layers.input_neurons import InputNeurons
 from ml_genn.layers.poisson_input_neurons import PoissonInputNeurons
 
+# Custom update to copy a batch from a device-resident dataset into input neurons
+copy_input_batch_model = create_custom_custom_update_class(
+    'copy_input_batch',
+    param_names=['size'],
+    var_refs=[('input', 'scalar')],
+    extra_global_params=[('dataset', 'scalar*'),
+                         ('batchOffset', 'unsigned int'),
+                         ('numSamples', 'unsigned int')],
+    update_code='''
+    // Lanes past the end of the dataset receive no input
+    const unsigned int sample = $(batchOffset) + $(batch);
+    if(sample < $(numSamples)) {
+        $(input) = $(dataset)[(sample * (unsigned int)$(size)) + $(id)];
+    }
+    else {
+        $(input) = 0.0;
+    }
+    ''')
+
 class InputLayer(BaseLayer):
 
     def __init__(self, name, shape, neurons=PoissonInputNeurons()):
@@ -12,6 +32,21 @@ class InputLayer(BaseLayer):
 
         super(InputLayer, self).__init__(name, neurons)
         self.shape = shape
+        self.dataset_update = None
+
+    def compile_neurons(self, mlg_model):
+        super(InputLayer, self).compile_neurons(mlg_model)
+
+        # If model has a device-resident dataset, add custom update to select batches from it
+        if mlg_model.device_dataset_size is not None:
+            n = int(np.prod(self.shape))
+            self.dataset_update = mlg_model.g_model.add_custom_update(
+                '{}_dataset'.format(self.name), 'SetInputBatch', copy_input_batch_model,
+                {'size': n}, {}, {'input': create_var_ref(self.neurons.nrn, 'input')})
+            self.dataset_update.set_extra_global_param(
+                'dataset', np.zeros(mlg_model.device_dataset_size * n, dtype=np.float32))
+            self.dataset_update.set_extra_global_param('batchOffset', 0)
+            self.dataset_update.set_extra_global_param('numSamples', 0)
 
     def set_input_batch(self, data_batch):
         nrn = self.neurons.nrn
@@ -32,5 +67,48 @@ class InputLayer(BaseLayer):
         if data_batch.shape[1:] != self.shape:
             raise ValueError('data shape {} != input shape {}'.format(data_batch.shape[1:], self.shape))
 
+        # Copy data into first lanes and clear input of any remaining lanes so they emit no spikes
         input_view[:data_batch.shape[0]] = data_batch.reshape(data_batch.shape[0], -1)
+        input_view[data_batch.shape[0]:] = 0.0
+        nrn.push_var_to_device('input')
+
+    def clear_input(self):
+        nrn = self.neurons.nrn
+        nrn.vars['input'].view[:] = 0.0
+        nrn.push_var_to_device('input')
+
+    def set_input_dataset(self, data):
+        if self.dataset_update is None:
+            raise RuntimeError('model was not compiled with a device dataset')
+
+        # Check input dimensions
+        if data.shape[1:] != self.shape:
+            raise ValueError('data shape {} != input shape {}'.format(data.shape[1:], self.shape))
+
+        # Check dataset fits in device buffer
+        dataset_view = self.dataset_update.extra_global_params['dataset'].view
+        if data.size > dataset_view.shape[0]:
+            raise ValueError('dataset size {} > device dataset size {}'.format(
+                data.shape[0], dataset_view.shape[0] // int(np.prod(self.shape))))
+
+        # Copy whole dataset to device once
+        dataset_view[:data.size] = data.reshape(-1)
+        self.dataset_update.push_extra_global_param_to_device('dataset', data.size)
+        self.dataset_update.extra_global_params['numSamples'].view[:] = data.shape[0]
+
+    def set_input_batch_offset(self, batch_offset):
+        self.dataset_update.extra_global_params['batchOffset'].view[:] = batch_offset
+
+    def set_input_lanes(self, lanes, data_lanes):
+        nrn = self.neurons.nrn
+        input_view = nrn.vars['input'].view.reshape(-1, int(np.prod(self.shape)))
+
+        # Check input dimensions
+        if data_lanes.shape[1:] != self.shape:
+            raise ValueError('data shape {} != input shape {}'.format(data_lanes.shape[1:], self.shape))
+
+        # Copy data into first lanes and clear input of any remaining lanes
+        n = data_lanes.shape[0]
+        input_view[lanes[:n]] = data_lanes.reshape(n, -1)
+        input_view[lanes[n:]] = 0.0
         nrn.push_var_to_device('input')
@@ -0,0 +1,41 @@
+from pygenn.genn_model import create_custom_neuron_class
+from ml_genn.layers.neurons import Neurons
+
+def create_integrator_model(lane_reset=False):
+    # If required, also restart individual batch lanes flagged by the 'ResetLanes' custom update
+    var_name_types = [('Vmem', 'scalar')]
+    restart_condition = ''
+    if lane_reset:
+        var_name_types.append(('Restart', 'unsigned int'))
+        restart_condition = ' || $(Restart)'
+
+    # Non-spiking neurons which accumulate their input over the presentation
+    return create_custom_neuron_class(
+        'integrator' + ('_lane_reset' if lane_reset else ''),
+        var_name_types=var_name_types,
+        sim_code='''
+        if ($(t) == 0.0{}) {{
+            // Reset state at t = 0, discarding input from spikes
+            // emitted on the last timestep of the previous presentation
+            $(Vmem) = 0.0;
+            {}
+        }}
+        else {{
+            $(Vmem) += $(Isyn) * DT;
+        }}
+        '''.format(restart_condition, '$(Restart) = 0;' if lane_reset else ''),
+        is_auto_refractory_required=False,
+    )
+
+class IntegratorNeurons(Neurons):
+    score_var = 'Vmem'
+    score_type = 'scalar'
+
+    def compile(self, mlg_model, layer):
+        model = create_integrator_model(mlg_model.continuous_batching)
+        vars = {'Vmem': 0.0}
+        if mlg_model.continuous_batching:
+            vars['Restart'] = 0
+
+        super(IntegratorNeurons, self).compile(mlg_model, layer, model, {}, vars, {})
+        self.compile_lane_reset(mlg_model, layer)
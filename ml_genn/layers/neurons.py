@@ -1,4 +1,70 @@
+import numpy as np
+from pygenn.genn_model import create_var_ref
+
 from ml_genn.layers.base_neurons import BaseNeurons
+from ml_genn.layers.top_k_models import create_top_k_max_model
+from ml_genn.layers.top_k_models import create_top_k_arg_max_model
 
 class Neurons(BaseNeurons):
-    pass
+
+    # Name and type of variable holding output scores
+    score_var = None
+    score_type = None
+
+    def __init__(self):
+        super(Neurons, self).__init__()
+        self.top_k_updates = []
+        self.top_k_size = None
+
+    def compile_top_k(self, mlg_model, layer, k):
+        n = int(np.prod(layer.shape))
+        if k > n:
+            raise ValueError('device top k {} > output layer size {}'.format(k, n))
+
+        # Add max and arg max custom updates for each stage to consecutive update groups
+        self.top_k_updates = []
+        self.top_k_size = n
+        arg_max_refs = {}
+        for j in range(k):
+            score_ref = create_var_ref(self.nrn, self.score_var)
+            max_update = mlg_model.g_model.add_custom_update(
+                '{}_top_k_max_{}'.format(layer.name, j), 'OutputTopK{}'.format(2 * j),
+                create_top_k_max_model(self.score_type, j), {'size': n}, {'MaxScore': 0.0},
+                dict(Score=score_ref, **arg_max_refs))
+            arg_max_update = mlg_model.g_model.add_custom_update(
+                '{}_top_k_arg_max_{}'.format(layer.name, j), 'OutputTopK{}'.format((2 * j) + 1),
+                create_top_k_arg_max_model(self.score_type, j), {'size': n}, {'ArgMax': 0.0},
+                dict(Score=score_ref, MaxScore=create_var_ref(max_update, 'MaxScore'), **arg_max_refs))
+
+            arg_max_refs['ArgMax{}'.format(j)] = create_var_ref(arg_max_update, 'ArgMax')
+            self.top_k_updates.append((max_update, arg_max_update))
+
+    def get_top_k(self, batch_n):
+        # Download only the k highest scores and their indices from the
+        # device, assuming the 'OutputTopK' custom updates have been run
+        k = len(self.top_k_updates)
+        indices = np.empty((batch_n, k), dtype=int)
+        scores = np.empty((batch_n, k))
+        for j, (max_update, arg_max_update) in enumerate(self.top_k_updates):
+            max_update.pull_var_from_device('MaxScore')
+            arg_max_update.pull_var_from_device('ArgMax')
+            scores[:, j] = max_update.vars['MaxScore'].view.reshape(-1)[:batch_n]
+            indices[:, j] = self.top_k_size - 1 - arg_max_update.vars['ArgMax'].view.reshape(-1)[:batch_n]
+        return indices, scores
+
+    def get_scores(self, batch_n):
+        self.nrn.pull_var_from_device(self.score_var)
+        if self.nrn.vars[self.score_var].view.ndim == 1:
+            return self.nrn.vars[self.score_var].view[np.newaxis]
+        else:
+            return self.nrn.vars[self.score_var].view[:batch_n]
+
+    def get_predictions(self, batch_n):
+        # If top k is found on device, only download index of highest score
+        if self.top_k_updates:
+            arg_max_update = self.top_k_updates[0][1]
+            arg_max_update.pull_var_from_device('ArgMax')
+            arg_max = arg_max_update.vars['ArgMax'].view.reshape(-1)[:batch_n]
+            return self.top_k_size - 1 - arg_max.astype(int)
+        else:
+            return self.get_scores(batch_n).argmax(axis=1)
@@ -0,0 +1,40 @@
+from pygenn.genn_model import create_custom_neuron_class
+from ml_genn.layers.input_neurons import InputNeurons
+
+# Phase coding input model where inputs are quantised to K bits and, in each
+# period of K timesteps, bit k (most significant first) is emitted as a spike in phase k
+phase_input_model = create_custom_neuron_class(
+    'phase_input',
+    param_names=['K', 'scale'],
+    var_name_types=[('input', 'scalar')],
+    sim_code='''
+    // Convert K to integer
+    const int kInt = (int)$(K);
+
+    // Get phase within period
+    const int phase = (int)rint($(t) / DT) % kInt;
+
+    // Quantise input to K bits
+    const int maxQuant = (1 << kInt) - 1;
+    const int quant = min(maxQuant, (int)(fmax($(input) / $(scale), 0.0) * (1 << kInt)));
+    ''',
+    threshold_condition_code='''
+    (quant >> (kInt - (1 + phase))) & 1
+    ''',
+    is_auto_refractory_required=False,
+)
+
+class PhaseInputNeurons(InputNeurons):
+
+    def __init__(self, K=8, scale=1.0):
+        super(PhaseInputNeurons, self).__init__()
+        self.K = K
+        self.scale = scale
+
+    def compile(self, mlg_model, layer):
+        model = phase_input_model
+        params = {'K': self.K, 'scale': self.scale}
+        vars = {'input': 0.0}
+
+        super(PhaseInputNeurons, self).compile(mlg_model, layer,
+                                               model, params, vars, {})
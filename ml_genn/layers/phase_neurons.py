@@ -0,0 +1,77 @@
+from pygenn.genn_model import create_custom_neuron_class
+from ml_genn.layers.neurons import Neurons
+
+def create_phase_model(lane_reset=False):
+    # If required, also restart individual batch lanes flagged by the 'ResetLanes' custom update
+    var_name_types = [('Vmem', 'scalar'), ('Fx', 'scalar')]
+    restart_condition = ''
+    if lane_reset:
+        var_name_types.append(('Restart', 'unsigned int'))
+        restart_condition = ' || $(Restart)'
+
+    # Phase coding model where a spike emitted in phase k of each period of K
+    # timesteps has weight 2^-(k+1). Neurons integrate input like IF neurons
+    # which reset by subtraction but both thresholds and input are weighted by phase.
+    # **NOTE** phase is global so incoming spikes are weighted by the receiving neuron
+    return create_custom_neuron_class(
+        'phase' + ('_lane_reset' if lane_reset else ''),
+        param_names=['K'],
+        var_name_types=var_name_types,
+        extra_global_params=[('Vthr', 'scalar')],
+        sim_code='''
+        // Convert K to integer
+        const int kInt = (int)$(K);
+
+        // Get phase within period
+        const int timestep = (int)rint($(t) / DT);
+        const int phase = timestep % kInt;
+        if (timestep == 0{}) {{
+            // Reset state at t = 0, discarding input from spikes
+            // emitted on the last timestep of the previous presentation
+            $(Vmem) = 0.0;
+            $(Fx) = 0.0;
+            {}
+        }}
+        else {{
+            // Accumulate input, weighted by phase it was emitted in on the last timestep
+            const int inputPhase = (phase + kInt - 1) % kInt;
+            $(Vmem) += $(Isyn) / (scalar)(1 << (1 + inputPhase));
+        }}
+
+        const scalar hT = $(Vthr) / (scalar)(1 << (1 + phase));
+        '''.format(restart_condition, '$(Restart) = 0;' if lane_reset else ''),
+        threshold_condition_code='''
+        $(Vmem) >= hT
+        ''',
+        reset_code='''
+        $(Vmem) -= hT;
+        $(Fx) += 1.0 / (scalar)(1 << (1 + phase));
+        ''',
+        is_auto_refractory_required=False,
+    )
+
+class PhaseNeurons(Neurons):
+    score_var = 'Fx'
+    score_type = 'scalar'
+
+    def __init__(self, K=8, threshold=1.0):
+        super(PhaseNeurons, self).__init__()
+        self.K = K
+        self.threshold = threshold
+
+    def compile(self, mlg_model, layer):
+        model = create_phase_model(mlg_model.continuous_batching)
+        params = {'K': self.K}
+        vars = {'Vmem': 0.0, 'Fx': 0.0}
+        if mlg_model.continuous_batching:
+            vars['Restart'] = 0
+        egp = {'Vthr': self.threshold}
+
+        super(PhaseNeurons, self).compile(mlg_model, layer, model, params, vars, egp)
+        self.compile_lane_reset(mlg_model, layer)
+
+    def set_threshold(self, threshold):
+        self.threshold = threshold
+
+        if self.nrn is not None:
+            self.nrn.extra_global_params['Vthr'].view[:] = threshold
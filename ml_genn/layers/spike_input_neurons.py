@@ -1,10 +1,9 @@
 from pygenn.genn_model import create_custom_neuron_class
-from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY_DUPLICATE
 from ml_genn.layers.input_neurons import InputNeurons
 
 spike_input_model = create_custom_neuron_class(
     'spike_input',
-    var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE)],
+    var_name_types=[('input', 'scalar')],
     sim_code='''
     const bool spike = $(input) != 0.0;
     ''',
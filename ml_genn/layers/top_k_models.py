@@ -0,0 +1,37 @@
+from pygenn.genn_model import create_custom_custom_update_class
+from pygenn.genn_wrapper.Models import (VarAccess_REDUCE_NEURON_MAX,
+                                        VarAccessMode_READ_ONLY)
+
+# Custom updates to find the k highest output scores of each batch lane on the device.
+# Stage j first reduces the highest score of neurons not already selected by
+# stages 0 to j-1 and then the index of the lowest neuron with that score.
+# **NOTE** indices are reduced as the key size - 1 - id so ties resolve to the lowest index like np.argmax
+
+def _excluded_code(stage):
+    # Generate expression which is true if this neuron was selected by a previous stage
+    return ' || '.join(['key == $(ArgMax{})'.format(i) for i in range(stage)]) or 'false'
+
+def create_top_k_max_model(score_type, stage):
+    return create_custom_custom_update_class(
+        'top_k_max_{}'.format(stage),
+        param_names=['size'],
+        var_name_types=[('MaxScore', 'scalar', VarAccess_REDUCE_NEURON_MAX)],
+        var_refs=([('Score', score_type, VarAccessMode_READ_ONLY)]
+                  + [('ArgMax{}'.format(i), 'scalar', VarAccessMode_READ_ONLY) for i in range(stage)]),
+        update_code='''
+        const scalar key = $(size) - 1.0 - $(id);
+        $(MaxScore) = ({}) ? -INFINITY : (scalar)$(Score);
+        '''.format(_excluded_code(stage)))
+
+def create_top_k_arg_max_model(score_type, stage):
+    return create_custom_custom_update_class(
+        'top_k_arg_max_{}'.format(stage),
+        param_names=['size'],
+        var_name_types=[('ArgMax', 'scalar', VarAccess_REDUCE_NEURON_MAX)],
+        var_refs=([('Score', score_type, VarAccessMode_READ_ONLY),
+                   ('MaxScore', 'scalar', VarAccessMode_READ_ONLY)]
+                  + [('ArgMax{}'.format(i), 'scalar', VarAccessMode_READ_ONLY) for i in range(stage)]),
+        update_code='''
+        const scalar key = $(size) - 1.0 - $(id);
+        $(ArgMax) = (!({}) && (scalar)$(Score) == $(MaxScore)) ? key : -1.0;
+        '''.format(_excluded_code(stage)))
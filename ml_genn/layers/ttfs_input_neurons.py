@@ -0,0 +1,38 @@
+from pygenn.genn_model import create_custom_neuron_class
+from ml_genn.layers.input_neurons import InputNeurons
+
+# Time-to-first-spike input model where inputs are encoded in the latency of
+# a single spike within the first window of the presentation: an input of scale
+# spikes at the start of the window and smaller inputs spike proportionally later
+ttfs_input_model = create_custom_neuron_class(
+    'ttfs_input',
+    param_names=['window', 'scale'],
+    var_name_types=[('input', 'scalar')],
+    sim_code='''
+    // Get timestep within presentation
+    const int timestep = (int)rint($(t) / DT);
+
+    // Calculate number of timesteps before the end of the window to spike
+    // **NOTE** inputs < scale / (2 * window) round to no spike at all
+    const int activationSteps = (int)rint(fmin($(input) / $(scale), 1.0) * $(window));
+    ''',
+    threshold_condition_code='''
+    activationSteps > 0 && timestep == ((int)$(window) - activationSteps)
+    ''',
+    is_auto_refractory_required=False,
+)
+
+class TTFSInputNeurons(InputNeurons):
+
+    def __init__(self, window=64, scale=1.0):
+        super(TTFSInputNeurons, self).__init__()
+        self.window = window
+        self.scale = scale
+
+    def compile(self, mlg_model, layer):
+        model = ttfs_input_model
+        params = {'window': self.window, 'scale': self.scale}
+        vars = {'input': 0.0}
+
+        super(TTFSInputNeurons, self).compile(mlg_model, layer,
+                                              model, params, vars, {})
@@ -0,0 +1,73 @@
+from pygenn.genn_model import create_custom_neuron_class
+from ml_genn.layers.neurons import Neurons
+
+# Time-to-first-spike model where each layer integrates the spikes of the layer
+# below during one window and then spikes at most once during the next window.
+# Each input spike adds its weight to a constant input current so, by the end of
+# the input window, an input which spiked k timesteps before the end has
+# contributed k times its weight. The membrane potential then ramps up towards
+# threshold so neurons with higher potentials spike earlier.
+# **NOTE** Vthr is the ratio of this layer's activation scale to the layer below's
+ttfs_model = create_custom_neuron_class(
+    'ttfs',
+    param_names=['window', 'start'],
+    var_name_types=[('Vmem', 'scalar'), ('Itotal', 'scalar'), ('nSpk', 'unsigned int')],
+    extra_global_params=[('Vthr', 'scalar')],
+    sim_code='''
+    // Get timestep within presentation
+    const int timestep = (int)rint($(t) / DT);
+    if (timestep == 0) {
+        // Reset state at t = 0
+        $(Vmem) = 0.0;
+        $(Itotal) = 0.0;
+        $(nSpk) = 0;
+    }
+
+    // Spikes emitted during input window are received one timestep later
+    const int inputEnd = (int)$(start) + (int)$(window);
+    const int outputEnd = inputEnd + (int)$(window);
+    if (timestep > (int)$(start) && timestep <= inputEnd) {
+        $(Itotal) += $(Isyn);
+        $(Vmem) += $(Itotal);
+    }
+    else if (timestep > inputEnd && timestep < outputEnd) {
+        $(Vmem) += $(Vthr);
+    }
+    ''',
+    threshold_condition_code='''
+    $(nSpk) == 0 && timestep >= inputEnd && timestep < outputEnd && $(Vmem) >= ($(Vthr) * $(window))
+    ''',
+    reset_code='''
+    $(nSpk) = 1;
+    ''',
+    is_auto_refractory_required=False,
+)
+
+class TTFSNeurons(Neurons):
+    score_var = 'Vmem'
+    score_type = 'scalar'
+
+    def __init__(self, window=64, layer_index=1, threshold=1.0):
+        super(TTFSNeurons, self).__init__()
+        self.window = window
+        self.layer_index = layer_index
+        self.threshold = threshold
+
+    def compile(self, mlg_model, layer):
+        # **NOTE** coding relies on time since t = 0 so lanes can't be reset individually
+        if mlg_model.continuous_batching:
+            raise NotImplementedError('TTFS neurons do not support continuous batching')
+
+        model = ttfs_model
+        params = {'window': self.window,
+                  'start': (self.layer_index - 1) * self.window}
+        vars = {'Vmem': 0.0, 'Itotal': 0.0, 'nSpk': 0}
+        egp = {'Vthr': self.threshold}
+
+        super(TTFSNeurons, self).compile(mlg_model, layer, model, params, vars, egp)
+
+    def set_threshold(self, threshold):
+        self.threshold = threshold
+
+        if self.nrn is not None:
+            self.nrn.extra_global_params['Vthr'].view[:] = threshold
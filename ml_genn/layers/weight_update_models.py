@@ -14,3 +14,22 @@ signed_static_pulse = create_custom_weight_update_class(
     $(input_pre) < 0.0 && spike
     '''
 )
+
+# Static pulse which delivers weight multiplied by the number
+# of spikes emitted by presynaptic neuron this timestep
+graded_static_pulse = create_custom_weight_update_class(
+    'graded_static_pulse',
+    var_name_types=[("g", "scalar", VarAccess_READ_ONLY)],
+    sim_code='''
+    $(addToInSyn, $(g) * $(Amp_pre));
+    '''
+)
+
+def get_wu_model(neurons):
+    # Select weight update model which can deliver spikes emitted by presynaptic neurons
+    if neurons.graded_spikes:
+        return graded_static_pulse
+    elif neurons.signed_spikes:
+        return signed_static_pulse
+    else:
+        return 'StaticPulse'
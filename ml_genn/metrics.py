@@ -0,0 +1,119 @@
+"""Incremental classification metrics
+
+This module provides the ``Metrics`` class which accumulates top-k hits
+and a confusion matrix for one output layer batch by batch. Metrics
+accumulated over different shards of a dataset (e.g. in separate
+processes) can be combined with ``merge``.
+
+Example:
+    The following evaluates a model on two shards and combines the results:
+
+        from ml_genn.metrics import Metrics
+
+        metrics_a = [Metrics(10, top_k=5)]
+        metrics_b = [Metrics(10, top_k=5)]
+        ml_genn_model.evaluate([x_a], [y_a], 500.0, metrics=metrics_a)
+        ml_genn_model.evaluate([x_b], [y_b], 500.0, metrics=metrics_b)
+        metrics_a[0].merge(metrics_b[0])
+        print(metrics_a[0].top_k_accuracy, metrics_a[0].per_class_accuracy)
+"""
+
+import numpy as np
+
+
+def decode_labels(labels):
+    """Convert one-hot or categorical labels to class indices
+
+    Args:
+    labels  --  array of class indices (optionally with shape (n, 1)) or of one-hot/categorical label vectors
+    """
+
+    labels = np.asarray(labels)
+
+    # **NOTE** trailing dimensions of size 1 e.g. (n, 1) hold class indices rather than one-hot vectors
+    if labels.ndim > 1 and labels.shape[-1] > 1:
+        return labels.argmax(axis=-1)
+    else:
+        return labels.reshape(-1).astype(int, copy=False)
+
+
+class Metrics(object):
+    """Classification metrics of one output layer"""
+
+    def __init__(self, num_classes, top_k=1):
+        """Create empty metrics
+
+        Args:
+        num_classes  --  number of classes (output neurons)
+
+        Keyword args:
+        top_k        --  number of highest scoring classes to count hits in (default: 1)
+        """
+
+        if top_k < 1 or top_k > num_classes:
+            raise ValueError('top_k must be between 1 and the number of classes')
+
+        self.num_classes = num_classes
+        self.top_k = top_k
+        self.n_samples = 0
+        self.top_k_correct = np.zeros(top_k, dtype=np.int64)
+        self.confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+
+    def update(self, labels, predictions):
+        """Add a batch of results
+
+        Args:
+        labels       --  array of class indices or of one-hot/categorical label vectors
+        predictions  --  array of predicted class indices or array of the top_k predicted
+                         class indices of each sample, sorted by descending score
+        """
+
+        labels = decode_labels(labels)
+        predictions = np.asarray(predictions).reshape(labels.shape[0], -1)
+        if predictions.shape[1] < self.top_k:
+            raise ValueError('{} predictions per sample < top_k {}'.format(
+                predictions.shape[1], self.top_k))
+
+        # Count hits within first 1, 2, ..., top_k predictions
+        hits = predictions[:, :self.top_k] == labels[:, np.newaxis]
+        self.top_k_correct += np.logical_or.accumulate(hits, axis=1).sum(axis=0)
+
+        # Add top-1 predictions to confusion matrix
+        self.confusion += np.bincount((labels * self.num_classes) + predictions[:, 0],
+                                      minlength=self.num_classes ** 2).reshape(
+                                          self.num_classes, self.num_classes)
+        self.n_samples += labels.shape[0]
+
+    def merge(self, other):
+        """Add results accumulated by another Metrics object
+
+        Args:
+        other  --  Metrics object with the same number of classes and top_k
+        """
+
+        if other.num_classes != self.num_classes or other.top_k != self.top_k:
+            raise ValueError('cannot merge metrics with different num_classes or top_k')
+
+        self.n_samples += other.n_samples
+        self.top_k_correct += other.top_k_correct
+        self.confusion += other.confusion
+
+    @property
+    def accuracy(self):
+        """Percentage of samples whose highest scoring class was correct"""
+        return self.top_k_accuracy[0]
+
+    @property
+    def top_k_accuracy(self):
+        """Percentage of samples whose correct class was within the 1, 2, ..., top_k highest scoring classes"""
+        if self.n_samples == 0:
+            return np.zeros(self.top_k)
+        else:
+            return (self.top_k_correct / self.n_samples) * 100
+
+    @property
+    def per_class_accuracy(self):
+        """Percentage of samples of each class which were correctly classified (NaN for absent classes)"""
+        class_samples = self.confusion.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (np.diag(self.confusion) / class_samples) * 100
@@ -19,16 +19,22 @@ Example:
 
 import os
 import numpy as np
-import tensorflow as tf
+from collections import deque
+from itertools import chain
 from tqdm import tqdm
 from pygenn.genn_model import GeNNModel
 
-from ml_genn.converters import Simple
+from ml_genn.build_cache import BuildCache
+from ml_genn.metrics import Metrics
+from ml_genn.prefetch import BatchPrefetcher
 from ml_genn.layers import InputLayer
 from ml_genn.layers import Dense
 from ml_genn.layers import AvePool2DDense
 from ml_genn.layers import Conv2D
 from ml_genn.layers import AvePool2DConv2D
+from ml_genn.layers import IntegratorNeurons
+from ml_genn.layers import FSReluNeurons
+from ml_genn.layers import FSReluInputNeurons
 
 
 class Model(object):
@@ -50,6 +56,12 @@ class Model(object):
         self.inputs = []
         self.outputs = []
         self.g_model = None
+        self.num_recording_timesteps = None
+        self.device_dataset_size = None
+        self.continuous_batching = False
+        self.device_top_k = None
+        self.timesteps_used = None
+        self.checkpoint_metrics = None
 
 
     def set_network(self, inputs, outputs, name='mlg_model'):
@@ -88,15 +100,33 @@ class Model(object):
 
 
     def compile(self, dt=1.0, batch_size=1, rng_seed=0, reuse_genn_model=False,
-                kernel_profiling=False, **genn_kwargs):
+                kernel_profiling=False, num_recording_timesteps=None,
+                device_dataset_size=None, continuous_batching=False, device_top_k=None,
+                cache_dir=None, cache_max_entries=16, **genn_kwargs):
         """Compile this ML GeNN model into a GeNN model
 
         Keyword args:
-        dt                --  model integration time step (default: 1.0)
-        batch_size        --  number of models to run concurrently (default: 1)
-        rng_seed          --  GeNN RNG seed (default: 0, meaning seed will be randomised at runtime)
-        reuse_genn_model  --  Reuse existing compiled GeNN model (default: False)
-        kernel_profiling  --  Build model with kernel profiling code (default: False)
+        dt                       --  model integration time step (default: 1.0)
+        batch_size               --  number of models to run concurrently (default: 1)
+        rng_seed                 --  GeNN RNG seed (default: 0, meaning seed will be randomised at runtime)
+        reuse_genn_model         --  Reuse existing compiled GeNN model (default: False)
+        kernel_profiling         --  Build model with kernel profiling code (default: False)
+        num_recording_timesteps  --  Size of on-device spike recording buffers, should match the
+                                     number of timesteps in each presentation (default: None,
+                                     meaning spikes are not recorded on device)
+        device_dataset_size      --  Maximum number of samples in a dataset uploaded to the device
+                                     with set_input_dataset (default: None, meaning inputs are
+                                     always copied from the host batch by batch)
+        continuous_batching      --  Build model with custom updates to reset individual batch
+                                     lanes, required by evaluate_continuous (default: False)
+        device_top_k             --  Number of highest output scores of each sample to find on
+                                     the device so only they and their indices are downloaded
+                                     (default: None, meaning all output scores are downloaded)
+        cache_dir                --  Directory of cache to store and reuse compiled GeNN models in,
+                                     keyed by a hash of the network and compile options (default:
+                                     None, meaning model is built in the working directory)
+        cache_max_entries        --  Maximum number of compiled GeNN models to keep in the cache
+                                     (default: 16)
         """
 
         # Define GeNN model
@@ -105,6 +135,8 @@ class Model(object):
         self.g_model.batch_size = batch_size
         self.g_model._model.set_seed(rng_seed)
         self.g_model.timing_enabled = kernel_profiling
+        self.device_dataset_size = device_dataset_size
+        self.continuous_batching = continuous_batching
 
         # Prepare each layer
         for layer in self.layers:
@@ -112,14 +144,38 @@ class Model(object):
         for layer in self.layers:
             layer.compile_synapses(self)
 
-        # Build and load GeNN model
-        if os.name == 'nt':
-            model_exists = os.path.isfile("./runner_Release.dll")
+        # Add custom updates to find top k output scores on device if required
+        self.device_top_k = device_top_k
+        if device_top_k is not None:
+            for layer in self.outputs:
+                layer.neurons.compile_top_k(self, layer, device_top_k)
+
+        # Enable on-device spike recording if required
+        self.num_recording_timesteps = num_recording_timesteps
+        if num_recording_timesteps is not None:
+            for layer in self.layers:
+                layer.neurons.nrn.spike_recording_enabled = True
+
+        # If a build cache is used, load GeNN model from it, building it if necessary
+        if cache_dir is not None:
+            cache = BuildCache(cache_dir, cache_max_entries)
+            key = cache.get_key(self, precision='float', dt=dt, batch_size=batch_size,
+                                rng_seed=rng_seed, kernel_profiling=kernel_profiling,
+                                spike_recording=num_recording_timesteps is not None,
+                                device_dataset=device_dataset_size is not None,
+                                continuous_batching=continuous_batching,
+                                device_top_k=device_top_k, genn_kwargs=genn_kwargs)
+            cache.build_and_load(self.g_model, key, num_recording_timesteps=num_recording_timesteps)
+
+        # Otherwise, build and load GeNN model in working directory
         else:
-            model_exists = os.path.isfile('./' + self.name + '_CODE/librunner.so')
-        if not reuse_genn_model or not model_exists:
-            self.g_model.build()
-        self.g_model.load()
+            if os.name == 'nt':
+                model_exists = os.path.isfile("./runner_Release.dll")
+            else:
+                model_exists = os.path.isfile('./' + self.name + '_CODE/librunner.so')
+            if not reuse_genn_model or not model_exists:
+                self.g_model.build()
+            self.g_model.load(num_recording_timesteps=num_recording_timesteps)
 
 
     def set_input_batch(self, data_batch):
@@ -137,6 +193,72 @@ class Model(object):
             self.inputs[i].set_input_batch(data_batch[i])
 
 
+    def set_input_dataset(self, data):
+        """Upload a whole dataset to the device so batches can be selected by offset
+
+        Args:
+        data  --  list of data for each input layer
+        """
+
+        # Input sanity check
+        if len(data) != len(self.inputs):
+            raise ValueError('data list length and input layer list length mismatch')
+
+        for i in range(len(self.inputs)):
+            self.inputs[i].set_input_dataset(data[i])
+
+
+    def set_input_batch_offset(self, batch_offset):
+        """Set model input to the batch starting at an offset into the device dataset
+
+        Args:
+        batch_offset  --  index of first sample of batch in dataset
+        """
+
+        for layer in self.inputs:
+            layer.set_input_batch_offset(batch_offset)
+        self.g_model.custom_update('SetInputBatch')
+
+
+    def clear_input(self):
+        """Clear model input so no batch lane emits input spikes"""
+
+        for layer in self.inputs:
+            layer.clear_input()
+
+
+    def set_input_lanes(self, lanes, data_lanes):
+        """Set model input of individual batch lanes
+
+        Args:
+        lanes       --  array of batch lane indices
+        data_lanes  --  list of data for each input layer, one sample per lane. If
+                        there are fewer samples than lanes, remaining lanes get no input
+        """
+
+        # Input sanity check
+        if len(data_lanes) != len(self.inputs):
+            raise ValueError('data lanes list length and input layer list length mismatch')
+
+        for i in range(len(self.inputs)):
+            self.inputs[i].set_input_lanes(lanes, data_lanes[i])
+
+
+    def reset_lanes(self, lanes):
+        """Reset the state of individual batch lanes on their next timestep
+
+        Args:
+        lanes  --  array of batch lane indices
+        """
+
+        if not self.continuous_batching:
+            raise RuntimeError('model was not compiled with continuous batching')
+
+        for layer in self.layers:
+            layer.neurons.set_reset_lanes(lanes)
+        self.g_model.custom_update('ResetLanes')
+
+
     def step_time(self, iterations=1):
         """Iterate the GeNN model a given number of steps
 
@@ -144,8 +266,11 @@ class Model(object):
         iterations  --  number of iterations (default: 1)
         """
 
+        # Bind the step method once so the loop does as little work as
+        # possible in the interpreter while keeping GeNN's loaded-state check
+        step_time = self.g_model.step_time
         for i in range(iterations):
-            self.g_model.step_time()
+            step_time()
 
 
     def reset(self):
@@ -155,21 +280,40 @@ class Model(object):
         self.g_model.t = 0.0
 
 
-    def evaluate(self, data, labels, time, save_samples=[]):
+    def evaluate(self, data, labels, time, save_samples=[], fused_steps=True,
+                 early_exit_margin=None, early_exit_interval=10.0, metrics=None,
+                 checkpoint_times=None):
         """Evaluate the accuracy of a GeNN model
 
         Args:
-        data          --  list of data for each input layer
-        labels        --  list of labels for each output layer
-        time          --  sample presentation time (msec)
+        data                 --  list of data for each input layer
+        labels               --  list of labels for each output layer
+        time                 --  sample presentation time (msec)
         
         Keyword args:
-        save_samples  --  list of sample indices to save spikes for (default: [])
+        save_samples         --  list of sample indices to save spikes for (default: [])
+        fused_steps          --  advance each presentation in a single call rather than
+                                 checking simulation time after every step (default: True)
+        early_exit_margin    --  end each presentation once the difference between the highest
+                                 and second highest output scores of every sample in the batch
+                                 reaches this margin (default: None, meaning the full time is used)
+        early_exit_interval  --  interval at which early exit margins are checked (msec) (default: 10.0)
+        metrics              --  list of Metrics objects for each output layer to accumulate
+                                 results into (default: None, meaning top-1 accuracy only)
+        checkpoint_times     --  list of times during each presentation at which to also read
+                                 out outputs (msec) (default: None)
 
         Returns:
-        accuracy      --  percentage of correctly classified results
-        spike_i       --  list of spike indices for each sample index in save_samples
-        spike_t       --  list of spike times for each sample index in save_samples
+        accuracy             --  percentage of correctly classified results or, if checkpoint_times
+                                 is provided, array of percentages at each checkpoint time
+                                 in ascending order
+        spike_i              --  list of spike indices for each sample index in save_samples
+        spike_t              --  list of spike times for each sample index in save_samples
+
+        When early exit is used, the number of timesteps each sample needed to
+        become confident is stored in ``timesteps_used``. When checkpoint_times
+        is provided, lists of Metrics objects for each output layer at each
+        checkpoint time in ascending order are stored in ``checkpoint_metrics``.
         """
 
         # Input sanity check
@@ -184,77 +328,605 @@ class Model(object):
         if any(i < 0 or i >= n_samples for i in save_samples):
             raise ValueError('one or more invalid save_samples value')
 
-        n_correct = [0] * len(self.outputs)
-        accuracy = [0] * len(self.outputs)
-        all_spikes = [[[] for i,_ in enumerate(self.layers)] for s in save_samples]
+        return self._evaluate_batches(self._data_batches(data, labels), time, n_samples,
+                                      save_samples, fused_steps, early_exit_margin,
+                                      early_exit_interval, metrics, checkpoint_times)
+
+
+    def evaluate_stream(self, data, time, labels=None, save_samples=[], fused_steps=True,
+                        early_exit_margin=None, early_exit_interval=10.0, prefetch_depth=2,
+                        metrics=None, checkpoint_times=None):
+        """Evaluate the accuracy of a GeNN model on a stream of batches
+
+        Batches are sliced, re-batched to the model batch size and converted
+        in a background thread while the previous batch is being simulated.
+
+        Args:
+        data                 --  list of (memory-mapped) data arrays for each input layer or,
+                                 if labels is None, an iterable or tf.data.Dataset yielding
+                                 (data, labels) batches
+        time                 --  sample presentation time (msec)
+
+        Keyword args:
+        labels               --  list of (memory-mapped) label arrays for each output layer
+                                 (default: None, meaning labels are provided by data)
+        save_samples         --  list of sample indices to save spikes for (default: [])
+        fused_steps          --  advance each presentation in a single call rather than
+                                 checking simulation time after every step (default: True)
+        early_exit_margin    --  end each presentation once the difference between the highest
+                                 and second highest output scores of every sample in the batch
+                                 reaches this margin (default: None, meaning the full time is used)
+        early_exit_interval  --  interval at which early exit margins are checked (msec) (default: 10.0)
+        prefetch_depth       --  maximum number of batches to prepare ahead (default: 2)
+        metrics              --  list of Metrics objects for each output layer to accumulate
+                                 results into (default: None, meaning top-1 accuracy only)
+        checkpoint_times     --  list of times during each presentation at which to also read
+                                 out outputs (msec) (default: None)
+
+        Returns:
+        accuracy             --  percentage of correctly classified results or, if checkpoint_times
+                                 is provided, array of percentages at each checkpoint time
+                                 in ascending order
+        spike_i              --  list of spike indices for each sample index in save_samples
+        spike_t              --  list of spike times for each sample index in save_samples
+
+        When checkpoint_times is provided, lists of Metrics objects for each output layer at each
+        checkpoint time in ascending order are stored in ``checkpoint_metrics``.
+        """
+
+        # Input sanity check
+        save_samples = list(set(save_samples))
+        if labels is None:
+            n_samples = None
+        else:
+            n_samples = data[0].shape[0]
+            if len(data) != len(self.inputs):
+                raise ValueError('data list length and input layer list length mismatch')
+            if len(labels) != len(self.outputs):
+                raise ValueError('label list length and output layer list length mismatch')
+            if not all(x.shape[0] == n_samples for x in data + labels):
+                raise ValueError('sample count mismatch in data and labels arrays')
+        if any(i < 0 or (n_samples is not None and i >= n_samples) for i in save_samples):
+            raise ValueError('one or more invalid save_samples value')
+
+        # Start loading batches in background
+        dtypes = [l.neurons.nrn.vars['input'].view.dtype for l in self.inputs]
+        prefetcher = BatchPrefetcher(data, labels, self.g_model.batch_size,
+                                     dtypes, prefetch_depth)
+
+        try:
+            return self._evaluate_batches(self._prefetched_batches(prefetcher), time, n_samples,
+                                          save_samples, fused_steps,
+                                          early_exit_margin, early_exit_interval, metrics,
+                                          checkpoint_times)
+        finally:
+            prefetcher.close()
+
+
+    def predict(self, data, time):
+        """Predict the class and output scores of each sample
+
+        Args:
+        data         --  list of data for each input layer
+        time         --  sample presentation time (msec)
+
+        Returns:
+        predictions  --  list of arrays of predicted class of each sample for each output layer
+        scores       --  list of arrays of output scores (e.g. spike counts) of each sample
+                         for each output layer or, if the model was compiled with device_top_k,
+                         the highest device_top_k scores of each sample in descending order
+        """
+
+        # Input sanity check
+        n_samples = data[0].shape[0]
+        if len(data) != len(self.inputs):
+            raise ValueError('data list length and input layer list length mismatch')
+        if not all(x.shape[0] == n_samples for x in data):
+            raise ValueError('sample count mismatch in data arrays')
+
+        # Score arrays are allocated once types and sizes of output scores are known
+        predictions = [np.empty(n_samples, dtype=int) for o in self.outputs]
+        scores = [None] * len(self.outputs)
+
+        # Copy predictions and scores of each batch once it has passed through pipeline
+        def read_outputs(batch_start, batch_n, batch_labels):
+            batch_end = batch_start + batch_n
+            for output_i, (batch_predictions, batch_scores) in enumerate(
+                    self._read_predictions(batch_n)):
+                predictions[output_i][batch_start:batch_end] = batch_predictions
 
-        # Pad number of samples so pipeline can be flushed
+                if scores[output_i] is None:
+                    scores[output_i] = np.empty((n_samples,) + batch_scores.shape[1:],
+                                                dtype=batch_scores.dtype)
+                scores[output_i][batch_start:batch_end] = batch_scores
+
+        self._evaluate_batches(self._data_batches(data), time, n_samples, [], True,
+                               None, None, None, None, read_outputs)
+
+        return predictions, scores
+
+    def predict_stream(self, data, time, prefetch_depth=2):
+        """Predict the class and output scores of each sample in a stream of batches
+
+        Batches are sliced, re-batched to the model batch size and converted
+        in a background thread while the previous batch is being simulated.
+
+        Args:
+        data            --  list of (memory-mapped) data arrays for each input layer or
+                            an iterable (e.g. generator) or tf.data.Dataset yielding data batches
+        time            --  sample presentation time (msec)
+
+        Keyword args:
+        prefetch_depth  --  maximum number of batches to prepare ahead (default: 2)
+
+        Returns:
+        predictions     --  list of arrays of predicted class of each sample for each output layer
+        scores          --  list of arrays of output scores (e.g. spike counts) of each sample
+                            for each output layer or, if the model was compiled with device_top_k,
+                            the highest device_top_k scores of each sample in descending order
+        """
+
+        # Input sanity check
+        if isinstance(data, list):
+            n_samples = data[0].shape[0]
+            if len(data) != len(self.inputs):
+                raise ValueError('data list length and input layer list length mismatch')
+            if not all(x.shape[0] == n_samples for x in data):
+                raise ValueError('sample count mismatch in data arrays')
+            labels = []
+        else:
+            n_samples = None
+            labels = None
+
+        # Start loading batches in background
+        dtypes = [l.neurons.nrn.vars['input'].view.dtype for l in self.inputs]
+        prefetcher = BatchPrefetcher(data, labels, self.g_model.batch_size,
+                                     dtypes, prefetch_depth, labelled=False)
+
+        # Number of samples may not be known in advance so gather predictions and scores of each batch
+        predictions = [[] for o in self.outputs]
+        scores = [[] for o in self.outputs]
+        def read_outputs(batch_start, batch_n, batch_labels):
+            for output_i, (batch_predictions, batch_scores) in enumerate(
+                    self._read_predictions(batch_n)):
+                predictions[output_i].append(batch_predictions)
+                scores[output_i].append(batch_scores)
+
+        try:
+            self._evaluate_batches(self._prefetched_batches(prefetcher), time, n_samples, [],
+                                   True, None, None, None, None, read_outputs)
+        finally:
+            prefetcher.close()
+
+        return ([np.concatenate(p) for p in predictions],
+                [np.concatenate(s) for s in scores])
+
+    def _read_predictions(self, batch_n):
+        """Read predicted class and output scores of each sample in batch for each output layer"""
+        for output in self.outputs:
+            if self.device_top_k is None:
+                batch_scores = output.neurons.get_scores(batch_n)
+                yield batch_scores.argmax(axis=1), batch_scores
+            else:
+                batch_indices, batch_scores = output.neurons.get_top_k(batch_n)
+                yield batch_indices[:, 0], batch_scores
+
+    def _prefetched_batches(self, prefetcher):
+        """Set input for each prefetched batch in turn, yielding its size and labels"""
+        for batch_data, batch_labels in prefetcher:
+            self.set_input_batch(batch_data)
+
+            yield batch_data[0].shape[0], batch_labels
+
+    def _data_batches(self, data, labels=None):
+        """Set input for each batch of data in turn, yielding its size and labels"""
+        n_samples = data[0].shape[0]
+
+        # If dataset fits on device, upload it once and select batches by offset
+        device_dataset = (self.device_dataset_size is not None
+                          and n_samples <= self.device_dataset_size)
+        if device_dataset:
+            self.set_input_dataset(data)
+
+        for batch_start in range(0, n_samples, self.g_model.batch_size):
+            batch_end = min(batch_start + self.g_model.batch_size, n_samples)
+            if device_dataset:
+                self.set_input_batch_offset(batch_start)
+            else:
+                self.set_input_batch([x[batch_start:batch_end] for x in data])
+
+            yield batch_end - batch_start, (None if labels is None
+                                            else [y[batch_start:batch_end] for y in labels])
+
+    def _evaluate_batches(self, batches, time, n_samples, save_samples, fused_steps,
+                          early_exit_margin, early_exit_interval, metrics, checkpoint_times,
+                          read_outputs=None):
+        """Present batches, reading out outputs of each batch once it has passed through the pipeline
+
+        If read_outputs is provided, it is called with the index of the first sample,
+        number of samples and labels of each batch instead of accumulating metrics.
+        """
+        metrics = self._create_metrics(metrics)
+        spike_i = [[None for i,_ in enumerate(self.layers)] for s in save_samples]
+        spike_t = [[None for i,_ in enumerate(self.layers)] for s in save_samples]
+        timesteps_used = []
+
+        # Calculate number of timesteps in each presentation
+        n_timesteps = self.calc_timesteps(time)
+
+        # Check recording buffers cover exactly one presentation
+        record_spikes = len(save_samples) > 0 and self.num_recording_timesteps is not None
+        if record_spikes and self.num_recording_timesteps != n_timesteps:
+            raise ValueError('number of recording timesteps {} != presentation timesteps {}'.format(
+                self.num_recording_timesteps, n_timesteps))
+
+        # Pad batches with empty presentations so pipeline can be flushed
         pipeline_depth = self.calc_pipeline_depth()
-        padded_n_samples = n_samples + (pipeline_depth * self.g_model.batch_size)
+        pipe_batches = deque()
+
+        # Check early exit is possible
+        early_exit = early_exit_margin is not None
+        if early_exit:
+            if pipeline_depth > 0:
+                raise ValueError('early exit is not supported by pipelined models')
+            early_exit_timesteps = max(1, self.calc_timesteps(early_exit_interval))
+
+        # Check checkpoints are possible and create metrics for each checkpoint
+        checkpoints = checkpoint_times is not None
+        if checkpoints:
+            if pipeline_depth > 0:
+                raise ValueError('checkpoints are not supported by pipelined models')
+            if early_exit:
+                raise ValueError('checkpoints cannot be combined with early exit')
+            if len(save_samples) > 0 and not record_spikes:
+                raise ValueError('checkpoints require spikes to be recorded on device')
+
+            checkpoint_timesteps = sorted(self.calc_timesteps(t) for t in checkpoint_times)
+            # **NOTE** outputs are only reset during the first timestep so they can't be read out before it
+            if any(t <= 0 or t > n_timesteps for t in checkpoint_timesteps):
+                raise ValueError('checkpoint times must be after the first timestep and within presentation time')
+            checkpoint_metrics = [[Metrics(m.num_classes, top_k=m.top_k) for m in metrics]
+                                  for t in checkpoint_timesteps]
+
+        # Unless outputs are read out by caller, accumulate metrics
+        # of each batch and only then report progress
+        progress = tqdm(total=n_samples, disable=read_outputs is not None)
+        if read_outputs is None:
+            def read_outputs(batch_start, batch_n, batch_labels):
+                # Compute accuracy
+                for output, output_labels, output_metrics in zip(self.outputs, batch_labels, metrics):
+                    output_metrics.update(output_labels, self._get_top_k_predictions(
+                        output, batch_n, output_metrics.top_k))
+                accuracy = [m.accuracy for m in metrics]
+
+                # Compute accuracy at each checkpoint
+                if checkpoints:
+                    for predictions, output_metrics in zip(checkpoint_predictions, checkpoint_metrics):
+                        for output_labels, output_predictions, m in zip(batch_labels, predictions, output_metrics):
+                            m.update(output_labels, output_predictions)
+
+                if early_exit and timesteps_used:
+                    progress.set_postfix_str('accuracy: {:2.2f}, timesteps: {:.1f}'.format(
+                        np.mean(accuracy), np.mean(timesteps_used)))
+                else:
+                    progress.set_postfix_str('accuracy: {:2.2f}'.format(np.mean(accuracy)))
 
         # Process batches
-        progress = tqdm(total=n_samples)
-        for batch_start in range(0, padded_n_samples, self.g_model.batch_size):
-            # If any elements of this batch have data (rather than being entirely pipeline padding)
-            if batch_start < n_samples:
-                batch_end = min(batch_start + self.g_model.batch_size, n_samples)
-                batch_data = [x[batch_start:batch_end] for x in data]
-
+        batch_start = 0
+        flushing = False
+        for batch in chain(batches, [None] * pipeline_depth):
+            # If this presentation has input (rather than being pipeline padding)
+            if batch is not None:
+                batch_n, batch_labels = batch
+                batch_end = batch_start + batch_n
                 save_samples_in_batch = [i for i in save_samples if batch_start <= i < batch_end]
+                pipe_batches.append((batch_start, batch_n, batch_labels))
+            else:
+                save_samples_in_batch = []
 
-                # Set new input
-                self.set_input_batch(batch_data)
+                # Clear input when pipeline starts being flushed so padding presentations
+                # only propagate spikes of batches already in the pipeline
+                if not flushing:
+                    self.clear_input()
+                    flushing = True
 
             # Reset timesteps etc
             self.reset()
 
-            # Main simulation loop
-            while self.g_model.t < time:
-                # Step time
-                self.step_time()
-
-                # Save spikes
-                for i in save_samples_in_batch:
+            # If checkpoints are used, simulate presentation in segments, reading out outputs at each checkpoint
+            if checkpoints:
+                timestep = 0
+                checkpoint_predictions = []
+                for t in checkpoint_timesteps:
+                    self.step_time(t - timestep)
+                    timestep = t
+
+                    self.update_top_k()
+                    checkpoint_predictions.append([self._get_top_k_predictions(output, batch_n, m.top_k)
+                                                   for output, m in zip(self.outputs, metrics)])
+                self.step_time(n_timesteps - timestep)
+
+                if save_samples_in_batch:
+                    self._pull_recorded_spikes(save_samples, save_samples_in_batch,
+                                               batch_start, spike_i, spike_t)
+
+            # If no spikes need saving and early exit is enabled, simulate until outputs are confident
+            elif early_exit and not save_samples_in_batch:
+                timesteps_used.extend(self._simulate_early_exit(
+                    batch_n, n_timesteps, early_exit_timesteps, early_exit_margin))
+
+            # Otherwise, if no spikes need saving, simulate whole presentation at once
+            elif fused_steps and not save_samples_in_batch:
+                self.step_time(n_timesteps)
+
+            # Otherwise, if spikes are recorded on device, simulate whole
+            # presentation and then download recording buffers once
+            elif record_spikes:
+                if fused_steps:
+                    self.step_time(n_timesteps)
+                else:
+                    while self.g_model.t < time:
+                        self.step_time()
+
+                self._pull_recorded_spikes(save_samples, save_samples_in_batch,
+                                           batch_start, spike_i, spike_t)
+
+            # Otherwise, main simulation loop
+            else:
+                batch_spikes = [[[] for l in self.layers] for i in save_samples_in_batch]
+                while self.g_model.t < time:
+                    # Step time
+                    self.step_time()
+
+                    # Save spikes
+                    if save_samples_in_batch:
+                        for l, layer in enumerate(self.layers):
+                            nrn = layer.neurons.nrn
+                            nrn.pull_current_spikes_from_device()
+                            for j, i in enumerate(save_samples_in_batch):
+                                batch_i = i - batch_start
+                                batch_spikes[j][l].append(np.copy(
+                                    nrn.current_spikes[batch_i] if self.g_model.batch_size > 1
+                                    else nrn.current_spikes))
+
+                # Create spike index and time arrays
+                for j, i in enumerate(save_samples_in_batch):
                     k = save_samples.index(i)
-                    batch_i = i - batch_start
-                    for l, layer in enumerate(self.layers):
-                        nrn = layer.neurons.nrn
-                        nrn.pull_current_spikes_from_device()
-                        all_spikes[k][l].append(np.copy(
-                            nrn.current_spikes[batch_i] if self.g_model.batch_size > 1
-                            else nrn.current_spikes))
+                    for l, spikes in enumerate(batch_spikes[j]):
+                        spike_i[k][l] = np.concatenate(spikes)
+                        spike_t[k][l] = np.concatenate([np.ones_like(s) * t * self.g_model.dT
+                                                        for t, s in enumerate(spikes)])
 
-            # If first input in batch has passed through
-            if batch_start >= (pipeline_depth * self.g_model.batch_size):
-                pipe_batch_start = batch_start - (pipeline_depth * self.g_model.batch_size)
-                pipe_batch_end = min(pipe_batch_start + self.g_model.batch_size, n_samples)
-                batch_labels = [y[pipe_batch_start:pipe_batch_end] for y in labels]
+            # Presentations which save spikes always use the full time
+            if early_exit and save_samples_in_batch:
+                timesteps_used.extend([n_timesteps] * batch_n)
 
-                # Compute accuracy
-                for output_i in range(len(self.outputs)):
-                    predictions = self.outputs[output_i].neurons.get_predictions(
-                        pipe_batch_end - pipe_batch_start)
-                    category_labels = (batch_labels[0].shape != predictions[0].shape)
-                    batch_labels = [np.argmax(i) for i in batch_labels] if category_labels else batch_labels
-                    n_correct[output_i] += np.sum(predictions == batch_labels[output_i])
-                    accuracy[output_i] = (n_correct[output_i] / pipe_batch_end) * 100
+            # If first input in batch has passed through
+            if len(pipe_batches) > pipeline_depth:
+                pipe_batch_start, pipe_batch_n, batch_labels = pipe_batches.popleft()
+                self.update_top_k()
+                read_outputs(pipe_batch_start, pipe_batch_n, batch_labels)
+                progress.update(pipe_batch_n)
 
-                progress.set_postfix_str('accuracy: {:2.2f}'.format(np.mean(accuracy)))
-                progress.update(pipe_batch_end - pipe_batch_start)
+            if batch is not None:
+                batch_start = batch_end
 
         progress.close()
 
-        # Create spike index and time lists
-        spike_i = [[None for i,_ in enumerate(self.layers)] for s in save_samples]
-        spike_t = [[None for i,_ in enumerate(self.layers)] for s in save_samples]
-        for i in range(len(save_samples)):
-            for j in range(len(self.layers)):
-                spikes = all_spikes[i][j]
-                spike_i[i][j] = np.concatenate(spikes)
-                spike_t[i][j] = np.concatenate([np.ones_like(s) * i * self.g_model.dT for i, s in enumerate(spikes)])
+        # Report distribution of timesteps used
+        if early_exit and timesteps_used:
+            self._set_timesteps_used(timesteps_used)
+
+        if checkpoints:
+            self.checkpoint_metrics = checkpoint_metrics
+            accuracy = [np.array([c[output_i].accuracy for c in checkpoint_metrics])
+                        for output_i in range(len(self.outputs))]
+        else:
+            accuracy = [m.accuracy for m in metrics]
 
         return accuracy, spike_i, spike_t
 
+    def _pull_recorded_spikes(self, save_samples, save_samples_in_batch, batch_start, spike_i, spike_t):
+        """Download spike recording buffers and copy spikes of saved samples"""
+        self.g_model.pull_recording_buffers_from_device()
+        for l, layer in enumerate(self.layers):
+            recording_data = layer.neurons.nrn.spike_recording_data
+            for i in save_samples_in_batch:
+                k = save_samples.index(i)
+                batch_i = i - batch_start
+                spike_t[k][l], spike_i[k][l] = (recording_data[batch_i] if self.g_model.batch_size > 1
+                                                else recording_data)
+
+    def evaluate_continuous(self, data, labels, time, early_exit_margin=None,
+                            early_exit_interval=10.0, metrics=None):
+        """Evaluate the accuracy of a GeNN model, refilling each batch lane as soon as its sample finishes
+
+        Rather than every lane in a batch waiting for the slowest sample, each
+        lane keeps its own presentation clock and, once its sample has used
+        its time budget or become confident, is reset and given the next sample.
+        Requires a model compiled with ``continuous_batching=True``.
+
+        Args:
+        data                 --  list of data for each input layer
+        labels               --  list of labels for each output layer
+        time                 --  sample presentation time (msec) or array of
+                                 presentation times for each sample
+
+        Keyword args:
+        early_exit_margin    --  end each presentation once the difference between the highest
+                                 and second highest output scores of the sample reaches this
+                                 margin (default: None, meaning the full time is used)
+        early_exit_interval  --  interval at which early exit margins are checked (msec) (default: 10.0)
+        metrics              --  list of Metrics objects for each output layer to accumulate
+                                 results into (default: None, meaning top-1 accuracy only)
+
+        Returns:
+        accuracy             --  percentage of correctly classified results
+
+        The number of timesteps each sample was presented for is stored in ``timesteps_used``.
+        """
+
+        # Input sanity check
+        n_samples = data[0].shape[0]
+        if len(data) != len(self.inputs):
+            raise ValueError('data list length and input layer list length mismatch')
+        if len(labels) != len(self.outputs):
+            raise ValueError('label list length and output layer list length mismatch')
+        if not all(x.shape[0] == n_samples for x in data + labels):
+            raise ValueError('sample count mismatch in data and labels arrays')
+        if not self.continuous_batching:
+            raise RuntimeError('model was not compiled with continuous batching')
+        if self.calc_pipeline_depth() > 0:
+            raise ValueError('continuous batching is not supported by pipelined models')
+
+        # Calculate number of timesteps each sample is presented for
+        budgets = np.asarray([self.calc_timesteps(t) for t in np.broadcast_to(time, (n_samples,))])
+        early_exit = early_exit_margin is not None
+        if early_exit:
+            early_exit_timesteps = max(1, self.calc_timesteps(early_exit_interval))
+
+        batch_size = self.g_model.batch_size
+        metrics = self._create_metrics(metrics)
+        predictions = [np.empty((n_samples, m.top_k), dtype=int) for m in metrics]
+        timesteps_used = np.empty(n_samples, dtype=int)
+
+        # Sample presented in each lane (-1 if lane is idle) and timestep its presentation started
+        lane_sample = np.full(batch_size, -1)
+        lane_start = np.zeros(batch_size, dtype=int)
+
+        # Reset timesteps so every lane is reset on first timestep
+        self.reset()
+
+        progress = tqdm(total=n_samples)
+        next_sample = 0
+        timestep = 0
+        refill_lanes = np.arange(batch_size)
+        while True:
+            # Load next samples into finished lanes, leaving lanes
+            # idle without input once there are no samples left
+            if len(refill_lanes) > 0:
+                refill_end = min(next_sample + len(refill_lanes), n_samples)
+                lane_sample[refill_lanes] = -1
+                lane_sample[refill_lanes[:refill_end - next_sample]] = np.arange(next_sample, refill_end)
+                lane_start[refill_lanes] = timestep
+                self.set_input_lanes(refill_lanes, [x[next_sample:refill_end] for x in data])
+                if timestep > 0:
+                    self.reset_lanes(refill_lanes)
+                next_sample = refill_end
+
+            busy = lane_sample >= 0
+            if not np.any(busy):
+                break
+
+            # Simulate until the next lane runs out of time or margins are next checked
+            elapsed = timestep - lane_start
+            n_steps = np.min(budgets[lane_sample[busy]] - elapsed[busy])
+            if early_exit:
+                n_steps = min(n_steps, early_exit_timesteps)
+            self.step_time(n_steps)
+            timestep += n_steps
+            elapsed += n_steps
+
+            # Determine which lanes have finished, either by
+            # using their whole budget or becoming confident
+            finished = busy & (elapsed >= budgets[lane_sample])
+            self.update_top_k()
+            if early_exit:
+                finished |= busy & self._get_confident(batch_size, early_exit_margin)
+
+            # Record predictions of finished lanes and mark them for refilling
+            refill_lanes = np.flatnonzero(finished)
+            if len(refill_lanes) > 0:
+                finished_samples = lane_sample[refill_lanes]
+                for output_i, output in enumerate(self.outputs):
+                    predictions[output_i][finished_samples] = self._get_top_k_predictions(
+                        output, batch_size, metrics[output_i].top_k)[refill_lanes]
+                timesteps_used[finished_samples] = elapsed[refill_lanes]
+            progress.update(len(refill_lanes))
+
+        progress.close()
+
+        # Compute accuracy
+        for output_labels, output_predictions, output_metrics in zip(labels, predictions, metrics):
+            output_metrics.update(output_labels, output_predictions)
+
+        self._set_timesteps_used(timesteps_used)
+
+        return [m.accuracy for m in metrics]
+
+    def _set_timesteps_used(self, timesteps_used):
+        """Store and report distribution of timesteps used by each sample"""
+        self.timesteps_used = np.asarray(timesteps_used)
+        print('timesteps used: mean {:.1f}, median {:.1f}, 95th percentile {:.1f}, max {}'.format(
+            np.mean(self.timesteps_used), np.median(self.timesteps_used),
+            np.percentile(self.timesteps_used, 95), np.max(self.timesteps_used)))
+
+    def _simulate_early_exit(self, batch_n, n_timesteps, check_timesteps, margin):
+        """Simulate a presentation until the outputs of every sample in the batch are confident"""
+        lane_timesteps = np.full(batch_n, n_timesteps)
+        timestep = 0
+        while timestep < n_timesteps:
+            # Simulate until next check
+            check_n = min(check_timesteps, n_timesteps - timestep)
+            self.step_time(check_n)
+            timestep += check_n
+
+            # Determine which lanes are confident
+            self.update_top_k()
+            confident = self._get_confident(batch_n, margin)
+
+            # Track timestep since which each lane has been confident
+            lane_timesteps = np.where(confident, np.minimum(lane_timesteps, timestep), n_timesteps)
+
+            if np.all(confident):
+                break
+
+        return lane_timesteps
+
+    def _create_metrics(self, metrics):
+        """Check or create metrics for each output layer"""
+        if metrics is None:
+            return [Metrics(int(np.prod(output.shape))) for output in self.outputs]
+        elif len(metrics) != len(self.outputs):
+            raise ValueError('metrics list length and output layer list length mismatch')
+        else:
+            return metrics
+
+    def _get_top_k_predictions(self, output, batch_n, k):
+        """Get indices of the k highest scoring classes of each sample, sorted by descending score"""
+        if k == 1:
+            return output.neurons.get_predictions(batch_n)[:, np.newaxis]
+        elif self.device_top_k is not None and self.device_top_k >= k:
+            return output.neurons.get_top_k(batch_n)[0][:, :k]
+        else:
+            # **NOTE** scores are converted to float so unsigned spike counts can be negated
+            scores = output.neurons.get_scores(batch_n).astype(float)
+            return np.argsort(-scores, axis=1, kind='stable')[:, :k]
+
+    def _get_confident(self, batch_n, margin):
+        """Determine which lanes have a large enough margin between top two scores in every output"""
+        confident = np.ones(batch_n, dtype=bool)
+        for output in self.outputs:
+            # If top 2 scores are found on device, only download them
+            if self.device_top_k is not None and self.device_top_k >= 2:
+                top_2 = output.neurons.get_top_k(batch_n)[1]
+                confident &= (top_2[:, 0] - top_2[:, 1]) >= margin
+            else:
+                top_2 = np.partition(output.neurons.get_scores(batch_n), -2, axis=1)[:, -2:]
+                confident &= (top_2[:, 1] - top_2[:, 0]) >= margin
+        return confident
+
+    def update_top_k(self):
+        """Find top k output scores on device if model was compiled with device_top_k"""
+        if self.device_top_k is not None:
+            for i in range(2 * self.device_top_k):
+                self.g_model.custom_update('OutputTopK{}'.format(i))
+
+    def calc_timesteps(self, time):
+        """Calculate number of timesteps required to simulate a given time"""
+        # **NOTE** round first so floating point error in time / dT doesn't add a timestep
+        return int(np.ceil(np.round(time / self.g_model.dT, 6)))
+
     def calc_pipeline_depth(self):
         """Calculate depth of model's pipeline"""
         # **TODO** this only works for sequential models, branches need to be identified etc with e.g. ResNets
@@ -276,8 +948,9 @@ class Model(object):
 
 
     @staticmethod
-    def convert_tf_model(tf_model, converter=Simple(),
-                         connectivity_type='procedural', **compile_kwargs):
+    def convert_tf_model(tf_model, converter=None,
+                         connectivity_type='procedural', integrator_output=False,
+                         **compile_kwargs):
         """Create a ML GeNN model from a TensorFlow model
 
         Args:
@@ -286,9 +959,19 @@ class Model(object):
         Keyword args:
         input_type         --  type of input neurons (default: 'poisson')
         connectivity_type  --  type of synapses in GeNN (default: 'procedural')
+        converter          --  converter to use (default: None, meaning Simple converter)
+        integrator_output  --  make final Dense layer non-spiking neurons which are read
+                               out by their accumulated input (default: False)
         compile_kwargs     --  additional arguments to pass through to Model.compile
         """
 
+        # **NOTE** TensorFlow and converters are only imported when converting
+        # so loading and running models doesn't pay their import cost
+        import tensorflow as tf
+        if converter is None:
+            from ml_genn.converters import Simple
+            converter = Simple()
+
         supported_tf_layers = (
             tf.keras.layers.Dense,
             tf.keras.layers.Conv2D,
@@ -305,6 +988,8 @@ class Model(object):
                 raise NotImplementedError('{} layers not supported'.format(type(tf_layer)))
             elif isinstance(tf_layer, (tf.keras.layers.Dense, tf.keras.layers.Conv2D)):
                 converter.validate_tf_layer(tf_layer)
+        if integrator_output and not isinstance(tf_model.layers[-1], tf.keras.layers.Dense):
+            raise NotImplementedError('integrator output requires final layer to be Dense')
 
         # Perform any pre-compilation tasks
         pre_compile_output = converter.pre_compile(tf_model)
@@ -331,10 +1016,19 @@ class Model(object):
 
             # === Dense Layers ===
             elif isinstance(tf_layer, tf.keras.layers.Dense):
+                # If required, make final layer integrate its input without spiking
+                if integrator_output and tf_layer is tf_model.layers[-1]:
+                    # **NOTE** few-spike neurons' spikes are weighted by the neurons receiving them
+                    if isinstance(previous_layer.neurons, (FSReluNeurons, FSReluInputNeurons)):
+                        raise NotImplementedError('integrator output not supported with few-spike neurons')
+                    neurons = IntegratorNeurons()
+                else:
+                    neurons = converter.create_neurons(tf_layer, pre_compile_output)
+
                 if pool_layer is None:
                     print('converting Dense layer <{}>'.format(tf_layer.name))
                     layer = Dense(name=tf_layer.name, units=tf_layer.units,
-                                  neurons=converter.create_neurons(tf_layer, pre_compile_output))
+                                  neurons=neurons)
                 else:
                     print('converting AveragePooling2D -> Dense layers <{}>'.format(tf_layer.name))
                     layer = AvePool2DDense(
@@ -343,7 +1037,7 @@ class Model(object):
                         pool_strides=pool_layer.strides,
                         pool_padding=pool_layer.padding,
                         connectivity_type=connectivity_type, 
-                        neurons=converter.create_neurons(tf_layer, pre_compile_output))
+                        neurons=neurons)
 
                 layer.connect([previous_layer])
                 layer.set_weights(tf_layer.get_weights())
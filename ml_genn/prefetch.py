@@ -0,0 +1,152 @@
+"""Background prefetching of data batches
+
+This module provides the ``BatchPrefetcher`` class which iterates over
+batches of data and labels from in-memory or memory-mapped arrays,
+generators or ``tf.data.Dataset`` objects. Batches are sliced, re-batched
+to the model's batch size and converted to the model's input types in a
+background thread so data preparation overlaps with simulation.
+"""
+
+import numpy as np
+from queue import Queue, Empty, Full
+from threading import Thread, Event
+
+
+def _as_list(x):
+    return list(x) if isinstance(x, (list, tuple)) else [x]
+
+
+def _array_chunks(data, labels, batch_size):
+    # Slice arrays into batches
+    # **NOTE** slicing memory-mapped arrays only reads them when batch is converted
+    n_samples = data[0].shape[0]
+    for batch_start in range(0, n_samples, batch_size):
+        batch_end = min(batch_start + batch_size, n_samples)
+        yield ([x[batch_start:batch_end] for x in data],
+               [y[batch_start:batch_end] for y in labels])
+
+
+def _iterator_chunks(source, labelled):
+    # If source is a tf.data.Dataset, iterate over it as numpy arrays
+    if hasattr(source, 'as_numpy_iterator'):
+        source = source.as_numpy_iterator()
+
+    if labelled:
+        for batch_data, batch_labels in source:
+            yield _as_list(batch_data), _as_list(batch_labels)
+    else:
+        for batch_data in source:
+            yield _as_list(batch_data), []
+
+
+def _rebatch(chunks, batch_size):
+    pending_data = None
+    pending_labels = None
+    for batch_data, batch_labels in chunks:
+        # Add chunk to any samples left over from previous chunks
+        if pending_data is None:
+            pending_data, pending_labels = batch_data, batch_labels
+        else:
+            pending_data = [np.concatenate([p, x]) for p, x in zip(pending_data, batch_data)]
+            pending_labels = [np.concatenate([p, y]) for p, y in zip(pending_labels, batch_labels)]
+
+        # Emit as many whole batches as possible
+        while pending_data[0].shape[0] >= batch_size:
+            yield ([x[:batch_size] for x in pending_data],
+                   [y[:batch_size] for y in pending_labels])
+            pending_data = [x[batch_size:] for x in pending_data]
+            pending_labels = [y[batch_size:] for y in pending_labels]
+
+        if pending_data[0].shape[0] == 0:
+            pending_data = None
+            pending_labels = None
+
+    # Emit final partial batch
+    if pending_data is not None:
+        yield pending_data, pending_labels
+
+
+class _LoadError(object):
+    def __init__(self, exception):
+        self.exception = exception
+
+
+_END = object()
+
+
+class BatchPrefetcher(object):
+    """Iterate over batches of data, preparing upcoming batches in a background thread"""
+
+    def __init__(self, data, labels, batch_size, dtypes, depth=2, labelled=True):
+        """Start prefetching batches
+
+        Args:
+        data        --  list of (memory-mapped) arrays for each input layer or, if labels
+                        is None, an iterable or tf.data.Dataset of (data, labels) batches
+        labels      --  list of (memory-mapped) arrays for each output layer or None
+        batch_size  --  number of samples in each batch
+        dtypes      --  list of data types to convert data for each input layer to
+
+        Keyword args:
+        depth       --  maximum number of batches to prepare ahead (default: 2)
+        labelled    --  if labels is None, whether data yields (data, labels) batches
+                        rather than data batches alone (default: True)
+        """
+
+        if labels is None:
+            chunks = _iterator_chunks(data, labelled)
+        else:
+            chunks = _array_chunks(data, labels, batch_size)
+
+        self.dtypes = dtypes
+        self.queue = Queue(maxsize=depth)
+        self.stop = Event()
+        self.thread = Thread(target=self._load, args=(_rebatch(chunks, batch_size),))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _END:
+                return
+            elif isinstance(item, _LoadError):
+                raise item.exception
+            else:
+                yield item
+
+    def close(self):
+        """Stop background thread"""
+
+        self.stop.set()
+
+        # Drain queue so background thread isn't blocked
+        while self.thread.is_alive():
+            try:
+                self.queue.get(timeout=0.1)
+            except Empty:
+                pass
+        self.thread.join()
+
+    def _put(self, item):
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _load(self, batches):
+        try:
+            for batch_data, batch_labels in batches:
+                # Convert data to input types and make contiguous so it can be copied straight into GeNN
+                batch_data = [np.ascontiguousarray(x, dtype=d)
+                              for x, d in zip(batch_data, self.dtypes)]
+                batch_labels = [np.asarray(y) for y in batch_labels]
+                if not self._put((batch_data, batch_labels)):
+                    return
+
+            self._put(_END)
+        except Exception as e:
+            self._put(_LoadError(e))
@@ -1,40 +1,195 @@
-from os import mkdir
+"""Saving and loading of ML GeNN models
+
+A model is saved to a directory containing ``model.json``, which describes
+the network graph in terms of the constructor arguments of each layer,
+its neurons and its upstream synapses, and ``weights.bin``, a single
+uncompressed binary file holding every weight array (and any other array
+arguments) at aligned offsets. When loading, arrays are memory-mapped
+straight from ``weights.bin`` so even large models load without parsing
+or copying weights more than once, and without TensorFlow or converters.
+
+Example:
+    The following saves a converted model and loads it again:
+
+        from ml_genn import save_model, load_model
+
+        save_model(ml_genn_model, 'vgg16_mlg')
+        ml_genn_model = load_model('vgg16_mlg')
+        ml_genn_model.compile(batch_size=64)
+"""
+
+import inspect
+import json
+import os
+from enum import Enum
+from importlib import import_module
+
 import numpy as np
 
+from ml_genn.model import Model
+
+FORMAT_VERSION = 1
+
+# Alignment of arrays in weights file
+ALIGNMENT = 64
+
+
+def _get_class_name(obj):
+    return '{}.{}'.format(type(obj).__module__, type(obj).__name__)
+
+
+def _get_class(class_name):
+    module_name, name = class_name.rsplit('.', 1)
+    return getattr(import_module(module_name), name)
+
+
+class _ArrayWriter(object):
+    def __init__(self, weights_file):
+        self.weights_file = weights_file
+        self.offset = 0
+
+    def write(self, array):
+        array = np.ascontiguousarray(array)
+
+        # Pad to alignment
+        padding = -self.offset % ALIGNMENT
+        self.weights_file.write(b'\0' * padding)
+        self.offset += padding
+
+        desc = {'offset': self.offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        self.weights_file.write(array.tobytes())
+        self.offset += array.nbytes
+        return desc
+
+
+def _encode(value, writer):
+    if isinstance(value, Enum):
+        return value.value
+    elif isinstance(value, np.ndarray):
+        return {'array': writer.write(value)}
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, (tuple, list)):
+        return [_encode(v, writer) for v in value]
+    else:
+        return value
+
+
+def _decode(value, weights):
+    if isinstance(value, dict) and 'array' in value:
+        return _read_array(value['array'], weights)
+    elif isinstance(value, list):
+        # **NOTE** shapes, sizes and strides are all tuples
+        return tuple(_decode(v, weights) for v in value)
+    else:
+        return value
+
+
+def _read_array(desc, weights):
+    dtype = np.dtype(desc['dtype'])
+    count = int(np.prod(desc['shape']))
+    return np.frombuffer(weights, dtype=dtype, count=count,
+                         offset=desc['offset']).reshape(desc['shape'])
+
+
+def _describe_object(obj, writer, exclude=()):
+    # Describe object in terms of its class and the constructor
+    # arguments required to recreate it, read from attributes
+    params = list(inspect.signature(type(obj).__init__).parameters)[1:]
+    args = {}
+    for p in params:
+        if p in exclude:
+            continue
+        if not hasattr(obj, p):
+            raise NotImplementedError('cannot save {} as it has no "{}" attribute'.format(
+                type(obj).__name__, p))
+        args[p] = _encode(getattr(obj, p), writer)
+
+    return {'class': _get_class_name(obj), 'args': args}
+
+
+def _create_object(desc, weights, **kwargs):
+    args = {k: _decode(v, weights) for k, v in desc['args'].items()}
+    args.update(kwargs)
+    return _get_class(desc['class'])(**args)
+
 
 def save_model(model, path):
-    mkdir(path)
+    """Save ML GeNN model
 
-    with open(path + '/name', 'w') as out_file:
-        out_file.write(model.name + '\n')
+    Args:
+    model  --  ML GeNN model with network set
+    path   --  directory to save model to
+    """
 
-    with open(path + '/layer_names', 'w') as out_file:
-        for i in range(len(model.layer_names)):
-            out_file.write(model.layer_names[i] + '\n')
+    os.makedirs(path, exist_ok=True)
 
-    for i in range(len(model.weight_vals)):
-        np.savetxt(path + '/weight_vals_' + model.layer_names[i], model.weight_vals[i])
+    with open(os.path.join(path, 'weights.bin'), 'wb') as weights_file:
+        writer = _ArrayWriter(weights_file)
 
-    for i in range(len(model.weight_conn)):
-        np.savetxt(path + '/weight_conn_' + model.layer_names[i], model.weight_conn[i])
+        # Describe layers in topological order
+        layers = []
+        for layer in model.layers:
+            layer_desc = _describe_object(layer, writer, exclude=('neurons',))
+            layer_desc['neurons'] = _describe_object(layer.neurons, writer)
+            layer_desc['upstream_synapses'] = [
+                {'source': s.source().name,
+                 'synapses': _describe_object(s, writer),
+                 'weights': writer.write(s.weights)}
+                for s in layer.upstream_synapses]
+            layers.append(layer_desc)
 
-    for i in range(len(model.thresholds)):
-        np.savetxt(path + '/threshold_' + model.layer_names[i], model.thresholds[i])
+    graph = {'format_version': FORMAT_VERSION,
+             'name': model.name,
+             'layers': layers,
+             'inputs': [l.name for l in model.inputs],
+             'outputs': [l.name for l in model.outputs]}
+    with open(os.path.join(path, 'model.json'), 'w') as model_file:
+        json.dump(graph, model_file, indent=1)
 
 
 def load_model(path):
-    with open(path + '/name', 'r') as in_file:
-        model.name = in_file.read().splitlines()
+    """Load ML GeNN model saved with save_model
+
+    Args:
+    path   --  directory model was saved to
+
+    Returns:
+    model  --  uncompiled ML GeNN model
+    """
+
+    with open(os.path.join(path, 'model.json'), 'r') as model_file:
+        graph = json.load(model_file)
+    if graph['format_version'] != FORMAT_VERSION:
+        raise ValueError('unsupported model format version {}'.format(graph['format_version']))
+
+    # Memory-map weights
+    weights_path = os.path.join(path, 'weights.bin')
+    if os.path.getsize(weights_path) > 0:
+        weights = np.memmap(weights_path, dtype=np.uint8, mode='r')
+    else:
+        weights = b''
 
-    with open(path + '/layer_names', 'r') as in_file:
-        for i in range(len(model.layer_names)):
-            model.layer_names[i] = in_file.read().splitlines()
+    # Create layers in topological order
+    layers = {}
+    for layer_desc in graph['layers']:
+        neurons = _create_object(layer_desc['neurons'], weights)
+        layer = _create_object(layer_desc, weights, neurons=neurons)
+        layers[layer.name] = layer
 
-    for i in range(len(model.weight_vals)):
-        model.weight_vals[i]= np.loadtxt(path + '/weight_vals_' + model.layer_names[i])
+        upstream = layer_desc['upstream_synapses']
+        if upstream:
+            # Connect layer to its sources, creating synapses if layer doesn't create its own
+            sources = [layers[u['source']] for u in upstream]
+            if 'synapses' in inspect.signature(layer.connect).parameters:
+                layer.connect(sources, [_create_object(u['synapses'], weights) for u in upstream])
+            else:
+                layer.connect(sources)
 
-    for i in range(len(model.weight_conn)):
-        model.weight_conn[i]= np.loadtxt(path + '/weight_conn_' + model.layer_names[i])
+            layer.set_weights([_read_array(u['weights'], weights) for u in upstream])
 
-    for i in range(len(model.thresholds)):
-        model.thresholds[i]= np.loadtxt(path + '/threshold_' + model.layer_names[i])
+    model = Model()
+    model.set_network([layers[n] for n in graph['inputs']],
+                      [layers[n] for n in graph['outputs']],
+                      name=graph['name'])
+    return model
@@ -1,2 +1,12 @@
-from ml_genn.utils.plotting import raster_plot
-from ml_genn.utils.arguments import parse_arguments
+from importlib import import_module
+
+# Plotting and argument parsing pull in matplotlib and TensorFlow
+# so are only imported when they are first accessed
+_lazy_attributes = {'raster_plot': 'ml_genn.utils.plotting',
+                    'parse_arguments': 'ml_genn.utils.arguments'}
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        return getattr(import_module(_lazy_attributes[name]), name)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
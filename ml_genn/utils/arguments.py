@@ -3,11 +3,14 @@ from functools import partial
 
 from ml_genn.layers import InputType
 from ml_genn.layers import ConnectivityType
+from ml_genn.layers import ResetMode
 from ml_genn.converters import ConverterType
 from ml_genn.converters import Simple
 from ml_genn.converters import DataNorm
 from ml_genn.converters import SpikeNorm
 from ml_genn.converters import FewSpike
+from ml_genn.converters import TTFS
+from ml_genn.converters import Phase
 
 
 def parse_arguments(model_description='ML GeNN model'):
@@ -25,17 +28,34 @@ def parse_arguments(model_description='ML GeNN model'):
                         choices=[i.value for i in InputType])
     parser.add_argument('--connectivity-type', default='procedural',
                         choices=[i.value for i in ConnectivityType])
+    parser.add_argument('--reset', default='zero',
+                        choices=[i.value for i in ResetMode])
+    parser.add_argument('--max-spikes', type=int, default=1)
     parser.add_argument('--kernel-profiling', action='store_true')
+    parser.add_argument('--device-dataset', action='store_true')
+    parser.add_argument('--device-top-k', type=int, default=None)
+    parser.add_argument('--cache-dir', default=None)
 
     # ANN conversion options
     parser.add_argument('--converter', default='few-spike',
                         choices=[i.value for i in ConverterType])
     parser.add_argument('--n-norm-samples', type=int, default=256)
+    parser.add_argument('--ttfs-window', type=int, default=64)
+    parser.add_argument('--phase-periods', type=int, default=4)
+    parser.add_argument('--norm-cache-dir', default=None)
+    parser.add_argument('--integrator-output', action='store_true')
+    parser.add_argument('--norm-patience', type=int, default=None)
+    parser.add_argument('--norm-batch-size', type=int, default=256)
+    parser.add_argument('--norm-percentile', type=float, default=None)
+    parser.add_argument('--norm-per-channel', action='store_true')
 
     # evaluation options
     parser.add_argument('--n-train-samples', type=int, default=None)
     parser.add_argument('--n-test-samples', type=int, default=None)
     parser.add_argument('--save-samples', type=int, default=[], nargs='+')
+    parser.add_argument('--unfused-steps', dest='fused_steps', action='store_false')
+    parser.add_argument('--early-exit-margin', type=float, default=None)
+    parser.add_argument('--early-exit-interval', type=float, default=10.0)
     parser.add_argument('--plot', action='store_true')
 
     # TensorFlow options
@@ -47,13 +67,26 @@ def parse_arguments(model_description='ML GeNN model'):
 
     def build_converter(self, norm_data, K=8, norm_time=500):
         if self.converter == 'few-spike':
-            return FewSpike(K=K, norm_data=[norm_data])
+            return FewSpike(K=K, norm_data=[norm_data], cache_dir=self.norm_cache_dir,
+                            norm_batch_size=self.norm_batch_size, percentile=self.norm_percentile)
         elif args.converter == 'data-norm':
-            return DataNorm(norm_data=[norm_data], input_type=self.input_type)
+            return DataNorm(norm_data=[norm_data], input_type=self.input_type,
+                            cache_dir=self.norm_cache_dir, norm_batch_size=self.norm_batch_size,
+                            percentile=self.norm_percentile, per_channel=self.norm_per_channel,
+                            reset=self.reset, max_spikes=self.max_spikes)
         elif args.converter == 'spike-norm':
-            return SpikeNorm(norm_data=[norm_data], norm_time=norm_time, input_type=self.input_type)
+            return SpikeNorm(norm_data=[norm_data], norm_time=norm_time, input_type=self.input_type,
+                             cache_dir=self.norm_cache_dir, patience=self.norm_patience,
+                             per_channel=self.norm_per_channel, reset=self.reset,
+                             max_spikes=self.max_spikes)
+        elif args.converter == 'ttfs':
+            return TTFS(norm_data=[norm_data], window=self.ttfs_window, cache_dir=self.norm_cache_dir,
+                        norm_batch_size=self.norm_batch_size, percentile=self.norm_percentile)
+        elif args.converter == 'phase':
+            return Phase(norm_data=[norm_data], K=K, cache_dir=self.norm_cache_dir,
+                         norm_batch_size=self.norm_batch_size, percentile=self.norm_percentile)
         else:
-            return Simple(input_type=self.input_type)
+            return Simple(input_type=self.input_type, reset=self.reset, max_spikes=self.max_spikes)
 
     args.build_converter = partial(build_converter, args)
 
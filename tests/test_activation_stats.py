@@ -0,0 +1,63 @@
+import numpy as np
+from ml_genn.converters.activation_stats import ActivationStats
+
+
+def test_activation_stats_max():
+    '''
+    Test maximum and per-channel maximum of activations.
+    '''
+
+    activations = np.random.rand(8, 4, 4, 3)
+    activations[..., 1] = 0.0
+
+    stats = ActivationStats()
+    stats.update(activations[:5])
+    stats.update(activations[5:])
+
+    assert stats.n_values == activations.size
+    assert stats.n_non_positive == 8 * 4 * 4
+    assert stats.max == activations.max()
+    assert np.allclose(stats.channel_max, activations.max(axis=(0, 1, 2)))
+
+
+def test_activation_stats_percentile():
+    '''
+    Test approximate percentiles lie within one histogram bin of exact percentiles.
+    '''
+
+    activations = np.random.exponential(size=(1000, 10))
+    activations[:100] = 0.0
+
+    stats = ActivationStats()
+    stats.update(activations)
+
+    for q in [50.0, 99.0, 99.9]:
+        exact = np.percentile(activations, q, method='higher')
+        approx = stats.percentile(q)
+        assert approx >= exact
+        assert approx <= exact * 2.0 ** (1.0 / 32.0)
+
+    assert stats.percentile(5.0) == 0.0
+    assert stats.percentile(100.0) == activations.max()
+
+
+def test_activation_stats_merge():
+    '''
+    Test merging statistics of shards matches statistics of all activations.
+    '''
+
+    activations = np.random.rand(100, 16)
+
+    stats = ActivationStats()
+    stats.update(activations)
+
+    stats_a = ActivationStats()
+    stats_b = ActivationStats()
+    stats_a.update(activations[:30])
+    stats_b.update(activations[30:])
+    stats_a.merge(stats_b)
+
+    assert stats_a.n_values == stats.n_values
+    assert stats_a.max == stats.max
+    assert np.array_equal(stats_a.channel_max, stats.channel_max)
+    assert np.array_equal(stats_a.histogram, stats.histogram)
@@ -0,0 +1,58 @@
+import numpy as np
+import ml_genn as mlg
+from ml_genn.build_cache import BuildCache
+from ml_genn.layers import InputLayer, Dense
+
+
+def build_model(units, weights):
+    inputs = InputLayer('input', (4,))
+    dense = Dense('dense', units)
+    dense.connect([inputs])
+    dense.set_weights([weights])
+
+    model = mlg.Model()
+    model.set_network([inputs], [dense], name='build_cache_test')
+    return model
+
+
+def test_build_cache_key_ignores_weights(tmpdir):
+    '''
+    Test models which only differ in weights share a cache key.
+    '''
+
+    cache = BuildCache(str(tmpdir))
+    key_a = cache.get_key(build_model(3, np.zeros((4, 3))), dt=1.0, batch_size=1)
+    key_b = cache.get_key(build_model(3, np.ones((4, 3))), dt=1.0, batch_size=1)
+
+    assert key_a == key_b
+
+
+def test_build_cache_key_changes(tmpdir):
+    '''
+    Test changes to architecture or compile options change the cache key.
+    '''
+
+    cache = BuildCache(str(tmpdir))
+    key = cache.get_key(build_model(3, np.zeros((4, 3))), dt=1.0, batch_size=1)
+
+    assert key != cache.get_key(build_model(5, np.zeros((4, 5))), dt=1.0, batch_size=1)
+    assert key != cache.get_key(build_model(3, np.zeros((4, 3))), dt=1.0, batch_size=2)
+    assert key != cache.get_key(build_model(3, np.zeros((4, 3))), dt=0.5, batch_size=1)
+
+
+def test_build_cache_evict(tmpdir):
+    '''
+    Test evicting least recently used entries deletes their directories and lock files.
+    '''
+
+    # Create complete entries, each more recently used than the last
+    for i, key in enumerate(['a', 'b', 'c']):
+        entry = tmpdir.mkdir(key)
+        entry.join('complete').write('')
+        entry.join('complete').setmtime(1000 + i)
+        tmpdir.join(key + '.lock').write('')
+
+    cache = BuildCache(str(tmpdir), max_entries=1)
+    cache.evict()
+
+    assert sorted(p.basename for p in tmpdir.listdir()) == ['c', 'c.lock', 'cache.lock']
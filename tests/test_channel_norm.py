@@ -0,0 +1,116 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from ml_genn.layers import InputLayer, Dense, IFNeurons
+from ml_genn.converters.channel_norm import (tile_channels, get_channel_thresholds,
+                                             scale_downstream_weights)
+
+
+def test_channel_norm_scale_downstream_weights():
+    '''
+    Test weights from each channel are scaled by its threshold relative to the largest.
+    '''
+
+    input_layer = InputLayer('input', (4,))
+    hidden = Dense('hidden', 3, neurons=IFNeurons(threshold=tile_channels([1.0, 2.0, 4.0], (3,))))
+    output = Dense('output', 2, neurons=IFNeurons(threshold=tile_channels([1.0, 1.0], (2,))))
+    hidden.connect([input_layer])
+    output.connect([hidden])
+
+    weights = np.arange(6, dtype=np.float64).reshape(3, 2)
+    output.set_weights([weights])
+
+    assert np.array_equal(get_channel_thresholds(hidden), [1.0, 2.0, 4.0])
+
+    scale_downstream_weights(hidden)
+
+    assert np.allclose(output.get_weights()[0],
+                       weights * np.array([0.25, 0.5, 1.0])[:, np.newaxis])
+
+
+def test_channel_norm_tile_channels():
+    '''
+    Test per-channel values are tiled over channels-last neuron indices.
+    '''
+
+    tiled = tile_channels([1.0, 2.0], (2, 3, 2))
+
+    assert tiled.shape == (12,)
+    assert np.array_equal(tiled.reshape(2, 3, 2)[..., 0], np.ones((2, 3)))
+    assert np.array_equal(tiled.reshape(2, 3, 2)[..., 1], np.full((2, 3), 2.0))
+
+
+def model_output_channels_differ(name):
+    # Inputs
+    rng = np.random.RandomState(1234)
+    x = rng.uniform(size=(16, 10)).astype(np.float32)
+
+    # Create TensorFlow model whose output channels have very different maximum activations
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(8, name='hidden', activation='relu', use_bias=False, input_shape=(10,)),
+        tf.keras.layers.Dense(4, name='output', activation='relu', use_bias=False),
+    ], name=name)
+    tf_model.set_weights([rng.uniform(0.0, 1.0, size=(10, 8)).astype(np.float32),
+                          (rng.uniform(0.0, 1.0, size=(8, 4)) * [1.0, 2.0, 4.0, 8.0]).astype(np.float32)])
+    return x, tf_model
+
+
+def test_channel_norm_data_norm_output_layer():
+    '''
+    Test DataNorm only gives per-channel thresholds to layers with downstream synapses.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x, tf_model = model_output_channels_differ('test_channel_norm_data_norm_output_layer')
+    converter = mlg.converters.DataNorm(norm_data=[x], input_type='if', per_channel=True)
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=converter, dt=1.0, batch_size=1)
+
+    hidden_neurons = mlg_model.layers[1].neurons
+    output_neurons = mlg_model.outputs[0].neurons
+    assert hidden_neurons.per_neuron_threshold
+    assert not output_neurons.per_neuron_threshold
+
+    # Output layer has the layer-wise threshold
+    hidden_y = np.maximum(x.dot(tf_model.get_weights()[0]), 0.0)
+    output_y = np.maximum(hidden_y.dot(tf_model.get_weights()[1]), 0.0)
+    assert np.isclose(output_neurons.threshold, output_y.max() / hidden_y.max(), rtol=1.0e-4)
+
+
+def test_channel_norm_spike_norm_output_layer():
+    '''
+    Test SpikeNorm only gives per-channel thresholds to layers with downstream synapses.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x, tf_model = model_output_channels_differ('test_channel_norm_spike_norm_output_layer')
+    converter = mlg.converters.SpikeNorm(norm_data=[x], norm_time=20.0, input_type='if',
+                                         per_channel=True)
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=converter, dt=1.0, batch_size=4)
+
+    assert mlg_model.layers[1].neurons.per_neuron_threshold
+    assert not mlg_model.outputs[0].neurons.per_neuron_threshold
+    assert np.ndim(mlg_model.outputs[0].neurons.threshold) == 0
+
+
+def test_channel_norm_spike_norm_integrator_output():
+    '''
+    Test SpikeNorm compensates for per-channel thresholds in weights to non-spiking output layer once.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x, tf_model = model_output_channels_differ('test_channel_norm_spike_norm_integrator_output')
+    converter = mlg.converters.SpikeNorm(norm_data=[x], norm_time=20.0, input_type='if',
+                                         per_channel=True)
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=converter, integrator_output=True,
+                                           dt=1.0, batch_size=4)
+
+    hidden_thresholds = get_channel_thresholds(mlg_model.layers[1])
+    factors = hidden_thresholds / hidden_thresholds.max()
+    assert np.allclose(mlg_model.outputs[0].get_weights()[0],
+                       tf_model.get_weights()[1] * factors[:, np.newaxis])
@@ -1,6 +1,8 @@
 import numpy as np
 import tensorflow as tf
 import ml_genn as mlg
+from ml_genn.layers import InputLayer, Conv2D, Dense
+from ml_genn.layers import IFNeurons, SpikeInputNeurons
 
 
 def model_compare_tf_and_mlg(tf_model, x, connectivity_type='procedural'):
@@ -298,6 +300,85 @@ def test_conv2d_in_chan_2_out_chan_2_padding_same_sparse():
     model_compare_tf_and_mlg(tf_model, x, connectivity_type='sparse')
 
 
+def build_set_weights_model(name, connectivity_type, kernel, thresholds):
+    # Create network of Conv2D layer with per-neuron thresholds and Dense output
+    inputs = InputLayer('input', (12, 12, 1), SpikeInputNeurons())
+    conv = Conv2D('conv', 2, (3, 3), connectivity_type=connectivity_type,
+                  neurons=IFNeurons(thresholds))
+    conv.connect([inputs])
+    conv.set_weights([kernel])
+    output = Dense('output', 3, neurons=IFNeurons(np.float64(np.inf)))
+    output.connect([conv])
+    output.set_weights([np.zeros((10 * 10 * 2, 3))])
+
+    mlg_model = mlg.Model()
+    mlg_model.set_network([inputs], [output], name=name)
+    mlg_model.compile(dt=1.0, batch_size=1)
+    return mlg_model
+
+
+def step_conv_vmem(mlg_model, timesteps):
+    mlg_model.step_time(timesteps)
+    conv_nrn = mlg_model.layers[1].neurons.nrn
+    conv_nrn.pull_var_from_device('Vmem')
+    return np.copy(conv_nrn.vars['Vmem'].view)
+
+
+def test_conv2d_set_weights_compiled_sparse():
+    '''
+    Test replacing sparse Conv2D weights after compilation matches compiling with them and keeps model state.
+    '''
+
+    # Inputs
+    x = np.empty((1, 12, 12, 1), dtype=np.float32)
+    x[0, :, :, 0] = model_input_0()
+
+    kernel = np.random.rand(3, 3, 1, 2)
+
+    # Simulate sparse model for a few timesteps before updating thresholds and Dense weights
+    mlg_model = build_set_weights_model('test_conv2d_set_weights_compiled_sparse', 'sparse',
+                                        np.ones((3, 3, 1, 2)), np.ones(10 * 10 * 2))
+    conv, output = mlg_model.layers[1:]
+    mlg_model.set_input_batch([x])
+
+    # Thresholds are high enough that no conv neuron spikes
+    thresholds = np.arange(10 * 10 * 2, dtype=np.float64) + 100.0
+    dense_weights = np.random.rand(10 * 10 * 2, 3)
+    conv.neurons.set_threshold(thresholds)
+    output.set_weights([dense_weights])
+    vmem = step_conv_vmem(mlg_model, 2)
+
+    # Replace Conv2D weights
+    conv.set_weights([kernel])
+
+    # Membrane voltages, input, thresholds and Dense weights are all kept
+    conv_nrn = conv.neurons.nrn
+    conv_nrn.pull_var_from_device('Vmem')
+    assert np.array_equal(conv_nrn.vars['Vmem'].view, vmem)
+
+    input_nrn = mlg_model.inputs[0].neurons.nrn
+    input_nrn.pull_var_from_device('input')
+    assert np.array_equal(input_nrn.vars['input'].view, x.flatten())
+
+    conv_nrn.pull_var_from_device('Vthr')
+    assert np.allclose(conv_nrn.vars['Vthr'].view, thresholds)
+
+    output_syn = output.upstream_synapses[0].syn
+    output_syn.pull_var_from_device('g')
+    assert np.allclose(output_syn.vars['g'].view, dense_weights.flatten())
+
+    # New Conv2D weights integrate input in the same way as a procedural model compiled with them
+    procedural_model = build_set_weights_model('test_conv2d_set_weights_compiled_procedural',
+                                               'procedural', kernel, thresholds)
+    procedural_model.set_input_batch([x])
+    procedural_vmem = step_conv_vmem(procedural_model, 2)
+
+    vmem_delta = step_conv_vmem(mlg_model, 2) - vmem
+    procedural_vmem_delta = step_conv_vmem(procedural_model, 2) - procedural_vmem
+    assert np.any(vmem_delta != 0.0)
+    assert np.allclose(vmem_delta, procedural_vmem_delta, rtol=0.0, atol=1.0e-5)
+
+
 if __name__ == '__main__':
     test_conv2d_in_chan_1_out_chan_1_padding_valid()
     test_conv2d_in_chan_2_out_chan_1_padding_valid()
@@ -306,3 +387,4 @@ if __name__ == '__main__':
     test_conv2d_in_chan_2_out_chan_2_padding_valid_sparse()
     test_conv2d_in_chan_2_out_chan_2_padding_same()
     test_conv2d_in_chan_2_out_chan_2_padding_same_sparse()
+    test_conv2d_set_weights_compiled_sparse()
@@ -118,7 +118,153 @@ def test_dense_all_off():
     model_compare_tf_and_mlg(tf_model, x)
 
 
+def test_dense_set_weights_compiled():
+    '''
+    Test Dense weights replaced after compilation.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Inputs
+    x = np.empty((1, 5), dtype=np.float32)
+    x[0, :] = model_input_all_on()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(7, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_dense_set_weights_compiled')
+    tf_model.set_weights([model_weights_0()])
+
+    # Compare TensorFlow and ML GeNN models
+    mlg_model = model_compare_tf_and_mlg(tf_model, x)
+
+    # Replace weights in both models
+    tf_model.set_weights([model_weights_0()[::-1]])
+    mlg_model.outputs[0].set_weights(tf_model.get_weights())
+    tf_y = tf_model(x).numpy()
+
+    # Run ML GeNN model again without recompiling
+    mlg_model.reset()
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(2)
+
+    nrn = mlg_model.outputs[0].neurons.nrn
+    nrn.pull_var_from_device('Vmem')
+    mlg_y = nrn.vars['Vmem'].view.reshape(tf_y.shape)
+
+    assert np.allclose(mlg_y, tf_y, rtol=0.0, atol=1.0e-5)
+
+
+def test_dense_reset_subtract():
+    '''
+    Test IF neurons which subtract threshold keep residual membrane potential.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Inputs
+    x = np.empty((1, 5), dtype=np.float32)
+    x[0, :] = model_input_all_on()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(1, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_dense_reset_subtract')
+    tf_model.set_weights([np.full((5, 1), 0.4, dtype=np.float32)])
+
+    # Convert model with neurons which reset by subtraction
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('spike', reset='subtract'),
+                                           dt=1.0, batch_size=1)
+    mlg_model.outputs[0].neurons.set_threshold(np.float64(1.5))
+
+    # Integrate an input of 2.0 on each of two timesteps
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(3)
+
+    nrn = mlg_model.outputs[0].neurons.nrn
+    nrn.pull_var_from_device('Vmem')
+    nrn.pull_var_from_device('nSpk')
+
+    assert np.allclose(nrn.vars['Vmem'].view, 1.0, rtol=0.0, atol=1.0e-5)
+    assert np.all(nrn.vars['nSpk'].view == 2)
+
+
+def test_dense_graded_spikes():
+    '''
+    Test IF neurons which emit several spikes per timestep deliver weight multiplied by spike count.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Inputs
+    x = np.empty((1, 5), dtype=np.float32)
+    x[0, :] = model_input_all_on()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(1, name='hidden', use_bias=False, input_shape=(5,)),
+        tf.keras.layers.Dense(1, name='output', use_bias=False),
+    ], name='test_dense_graded_spikes')
+    tf_model.set_weights([np.full((5, 1), 0.5, dtype=np.float32),
+                          np.ones((1, 1), dtype=np.float32)])
+
+    # Convert model with neurons which emit up to 4 spikes per timestep
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('spike', max_spikes=4),
+                                           dt=1.0, batch_size=1)
+    mlg_model.outputs[0].neurons.set_threshold(np.float64(np.inf))
+
+    # Hidden neuron integrates an input of 2.5 and emits 2 spikes on each of two timesteps
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(3)
+
+    hidden_nrn = mlg_model.layers[1].neurons.nrn
+    hidden_nrn.pull_var_from_device('nSpk')
+    output_nrn = mlg_model.outputs[0].neurons.nrn
+    output_nrn.pull_var_from_device('Vmem')
+
+    assert np.all(hidden_nrn.vars['nSpk'].view == 4)
+    assert np.allclose(output_nrn.vars['Vmem'].view, 2.0, rtol=0.0, atol=1.0e-5)
+
+
+def test_dense_integrator_output():
+    '''
+    Test non-spiking Dense output layer accumulates its input and is read out by it.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Inputs
+    x = np.empty((1, 5), dtype=np.float32)
+    x[0, :] = model_input_some_on()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(7, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_dense_integrator_output')
+    tf_model.set_weights([model_weights_0()])
+    tf_y = tf_model(x).numpy()
+
+    # Convert model with non-spiking output
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('spike'),
+                                           integrator_output=True, dt=1.0, batch_size=1)
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(2)
+
+    # Potential includes negative input, which would be lost by spiking neurons
+    output_neurons = mlg_model.outputs[0].neurons
+    assert np.allclose(output_neurons.get_scores(1), tf_y, rtol=0.0, atol=1.0e-5)
+    assert np.array_equal(output_neurons.get_predictions(1), tf_y.argmax(axis=1))
+
+
 if __name__ == '__main__':
     test_dense_all_on()
     test_dense_some_on()
     test_dense_all_off()
+    test_dense_set_weights_compiled()
+    test_dense_reset_subtract()
+    test_dense_graded_spikes()
+    test_dense_integrator_output()
@@ -0,0 +1,80 @@
+import numpy as np
+from ml_genn.metrics import Metrics
+
+
+def test_metrics_top_k():
+    '''
+    Test top-k hits with class index labels.
+    '''
+
+    metrics = Metrics(4, top_k=2)
+    metrics.update(np.array([0, 1, 2, 3]),
+                   np.array([[0, 1], [2, 1], [3, 0], [1, 2]]))
+
+    assert metrics.n_samples == 4
+    assert np.allclose(metrics.top_k_accuracy, [25.0, 50.0])
+    assert metrics.accuracy == 25.0
+
+
+def test_metrics_one_hot_labels():
+    '''
+    Test one-hot labels are decoded to class indices.
+    '''
+
+    metrics = Metrics(3)
+    metrics.update(np.eye(3)[[2, 0, 1]], np.array([2, 0, 0]))
+
+    assert np.isclose(metrics.accuracy, 200.0 / 3.0)
+    assert np.array_equal(metrics.confusion, [[1, 0, 0],
+                                              [1, 0, 0],
+                                              [0, 0, 1]])
+
+
+def test_metrics_column_labels():
+    '''
+    Test (n, 1) class index labels are not mistaken for one-hot labels.
+    '''
+
+    metrics = Metrics(3)
+    metrics.update(np.array([[2], [0], [1]]), np.array([2, 0, 0]))
+
+    assert np.isclose(metrics.accuracy, 200.0 / 3.0)
+    assert np.array_equal(metrics.confusion, [[1, 0, 0],
+                                              [1, 0, 0],
+                                              [0, 0, 1]])
+
+
+def test_metrics_per_class_accuracy():
+    '''
+    Test per-class accuracy, with NaN for classes with no samples.
+    '''
+
+    metrics = Metrics(3)
+    metrics.update(np.array([0, 0, 1, 1]), np.array([0, 1, 1, 1]))
+
+    per_class = metrics.per_class_accuracy
+    assert np.allclose(per_class[:2], [50.0, 100.0])
+    assert np.isnan(per_class[2])
+
+
+def test_metrics_merge():
+    '''
+    Test metrics accumulated over shards merge to the same result as one pass.
+    '''
+
+    rng = np.random.RandomState(1234)
+    labels = rng.randint(10, size=100)
+    predictions = np.argsort(-rng.rand(100, 10), axis=1)[:, :3]
+
+    single = Metrics(10, top_k=3)
+    single.update(labels, predictions)
+
+    shard_a = Metrics(10, top_k=3)
+    shard_b = Metrics(10, top_k=3)
+    shard_a.update(labels[:40], predictions[:40])
+    shard_b.update(labels[40:], predictions[40:])
+    shard_a.merge(shard_b)
+
+    assert shard_a.n_samples == single.n_samples
+    assert np.array_equal(shard_a.top_k_correct, single.top_k_correct)
+    assert np.array_equal(shard_a.confusion, single.confusion)
@@ -0,0 +1,269 @@
+import numpy as np
+import pytest
+import ml_genn as mlg
+from ml_genn.metrics import Metrics
+from ml_genn.layers import InputLayer, Dense
+from ml_genn.layers import IFNeurons, IFInputNeurons
+
+
+def build_model(name, weights, **compile_kwargs):
+    inputs = InputLayer('input', (weights[0].shape[0],), IFInputNeurons())
+    hidden = Dense('hidden', weights[0].shape[1], neurons=IFNeurons(1.0))
+    hidden.connect([inputs])
+    hidden.set_weights([weights[0]])
+    output = Dense('output', weights[1].shape[1], neurons=IFNeurons(1.0))
+    output.connect([hidden])
+    output.set_weights([weights[1]])
+
+    model = mlg.Model()
+    model.set_network([inputs], [output], name=name)
+    model.compile(dt=1.0, **compile_kwargs)
+    return model
+
+
+def model_data():
+    # 10 samples so batches of 4 end with a partial batch of 2
+    rng = np.random.RandomState(1234)
+    x = rng.uniform(size=(10, 8)).astype(np.float32)
+    weights = [rng.uniform(-0.5, 1.0, size=(8, 16)).astype(np.float32),
+               rng.uniform(-0.5, 1.0, size=(16, 4)).astype(np.float32)]
+    y = np.maximum(x.dot(weights[0]), 0.0).dot(weights[1]).argmax(axis=1)
+    return x, y, weights
+
+
+def test_model_device_dataset():
+    '''
+    Test evaluating from a device-resident dataset matches copying batches from the host.
+    '''
+
+    x, y, weights = model_data()
+
+    host_model = build_model('test_model_host_dataset', weights, batch_size=4)
+    host_accuracy = host_model.evaluate([x], [y], 50.0)[0]
+
+    device_model = build_model('test_model_device_dataset', weights, batch_size=4,
+                               device_dataset_size=10)
+    device_accuracy = device_model.evaluate([x], [y], 50.0)[0]
+
+    assert device_accuracy == host_accuracy
+
+    # Output spike counts of every sample, including the partial batch, also match
+    host_scores = host_model.predict([x], 50.0)[1][0]
+    device_scores = device_model.predict([x], 50.0)[1][0]
+    assert np.array_equal(device_scores, host_scores)
+
+
+def test_model_predict():
+    '''
+    Test predicting classes of each sample agrees with its output spike counts and with evaluate.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_predict', weights, batch_size=4)
+
+    predictions, scores = model.predict([x], 50.0)
+
+    assert predictions[0].shape == (10,)
+    assert scores[0].shape == (10, 4)
+    assert np.array_equal(predictions[0], scores[0].argmax(axis=1))
+
+    # Evaluating against predictions is therefore always correct
+    assert model.evaluate([x], predictions, 50.0)[0][0] == 100.0
+
+
+def test_model_partial_batch_lanes():
+    '''
+    Test unused lanes of a partial last batch emit no spikes in any layer.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_partial_batch_lanes', weights, batch_size=4)
+
+    # Lanes 2 and 3 of the final batch of 2 still hold state of the previous batch unless masked
+    model.evaluate([x], [y], 50.0)
+
+    for layer in model.layers[1:]:
+        nrn = layer.neurons.nrn
+        nrn.pull_var_from_device('nSpk')
+        assert np.any(nrn.vars['nSpk'].view[:2] > 0)
+        assert np.all(nrn.vars['nSpk'].view[2:] == 0)
+
+
+def chunks(x, y, chunk_size):
+    for i in range(0, x.shape[0], chunk_size):
+        yield x[i:i + chunk_size], y[i:i + chunk_size]
+
+
+def test_model_evaluate_stream():
+    '''
+    Test evaluating a stream of batches matches evaluate when source and model batch sizes differ.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_evaluate_stream', weights, batch_size=4)
+
+    metrics = [Metrics(4)]
+    accuracy = model.evaluate([x], [y], 50.0, metrics=metrics)[0]
+
+    # Chunks of 3 are re-batched into batches of 4, 4 and 2
+    stream_metrics = [Metrics(4)]
+    stream_accuracy = model.evaluate_stream(chunks(x, y, 3), 50.0, metrics=stream_metrics)[0]
+    assert stream_accuracy == accuracy
+    assert np.array_equal(stream_metrics[0].confusion, metrics[0].confusion)
+
+    # Arrays are sliced into batches of 4
+    stream_metrics = [Metrics(4)]
+    stream_accuracy = model.evaluate_stream([x], 50.0, labels=[y], metrics=stream_metrics)[0]
+    assert stream_accuracy == accuracy
+    assert np.array_equal(stream_metrics[0].confusion, metrics[0].confusion)
+
+
+def test_model_evaluate_stream_error():
+    '''
+    Test an exception raised while loading a batch in the background reaches the caller.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_evaluate_stream_error', weights, batch_size=4)
+
+    def failing_chunks():
+        yield x[:3], y[:3]
+        raise IOError('failed to read batch')
+
+    with pytest.raises(IOError, match='failed to read batch'):
+        model.evaluate_stream(failing_chunks(), 50.0)
+
+
+def test_model_predict_stream():
+    '''
+    Test predicting from a stream of batches matches predict.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_predict_stream', weights, batch_size=4)
+
+    predictions, scores = model.predict([x], 50.0)
+
+    stream_predictions, stream_scores = model.predict_stream(
+        (x_chunk for x_chunk, _ in chunks(x, y, 3)), 50.0)
+    assert np.array_equal(stream_predictions[0], predictions[0])
+    assert np.array_equal(stream_scores[0], scores[0])
+
+    stream_predictions, stream_scores = model.predict_stream([x], 50.0)
+    assert np.array_equal(stream_predictions[0], predictions[0])
+    assert np.array_equal(stream_scores[0], scores[0])
+
+
+def test_model_checkpoints():
+    '''
+    Test metrics read out at checkpoints during a presentation match separate evaluations of each length.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_checkpoints', weights, batch_size=4)
+
+    checkpoint_accuracy = model.evaluate([x], [y], 50.0, metrics=[Metrics(4, top_k=2)],
+                                         checkpoint_times=[50.0, 20.0])[0]
+    checkpoint_metrics = model.checkpoint_metrics
+
+    # Checkpoints are read out in ascending order
+    for i, time in enumerate([20.0, 50.0]):
+        metrics = [Metrics(4, top_k=2)]
+        accuracy = model.evaluate([x], [y], time, metrics=metrics)[0]
+
+        assert checkpoint_accuracy[0][i] == accuracy[0]
+        assert checkpoint_metrics[i][0].top_k == 2
+        assert np.array_equal(checkpoint_metrics[i][0].top_k_correct, metrics[0].top_k_correct)
+        assert np.array_equal(checkpoint_metrics[i][0].confusion, metrics[0].confusion)
+
+
+def test_model_checkpoints_invalid():
+    '''
+    Test checkpoints before outputs are first reset or after the end of the presentation are rejected.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_checkpoints_invalid', weights, batch_size=4)
+
+    with pytest.raises(ValueError):
+        model.evaluate([x], [y], 50.0, checkpoint_times=[0.0, 50.0])
+    with pytest.raises(ValueError):
+        model.evaluate([x], [y], 50.0, checkpoint_times=[20.0, 51.0])
+
+
+def test_model_device_top_k():
+    '''
+    Test k highest output scores found on the device match sorting them on the host, including ties.
+    '''
+
+    _, _, weights = model_data()
+    weights[1] = np.ones((16, 6), dtype=np.float32)
+    model = build_model('test_model_device_top_k', weights, batch_size=3, device_top_k=3)
+
+    # Write output spike counts with ties directly to the device
+    scores = np.array([[3, 1, 3, 0, 5, 5],
+                       [0, 0, 0, 0, 0, 0],
+                       [2, 7, 1, 7, 7, 4]], dtype=np.uint32)
+    output_neurons = model.outputs[0].neurons
+    output_neurons.nrn.vars['nSpk'].view[:] = scores
+    output_neurons.nrn.push_var_to_device('nSpk')
+    model.update_top_k()
+
+    # Ties are resolved to the lowest index like a stable sort
+    expected = np.argsort(-scores.astype(float), axis=1, kind='stable')[:, :3]
+    indices, top_scores = output_neurons.get_top_k(3)
+
+    assert np.array_equal(indices, expected)
+    assert np.array_equal(top_scores, np.take_along_axis(scores, expected, axis=1))
+    assert np.array_equal(output_neurons.get_predictions(3), expected[:, 0])
+
+
+def test_model_continuous_batching():
+    '''
+    Test refilling batch lanes as soon as their samples finish matches evaluating whole batches.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_continuous_batching', weights, batch_size=4,
+                        continuous_batching=True)
+
+    batch_metrics = [Metrics(4)]
+    model.evaluate([x], [y], 50.0, metrics=batch_metrics)
+
+    # Margin can never be reached so every sample uses its whole budget, but
+    # lanes are still refilled and any spikes in flight from their last sample dropped
+    continuous_metrics = [Metrics(4)]
+    model.evaluate_continuous([x], [y], 50.0, early_exit_margin=np.inf,
+                              early_exit_interval=7.0, metrics=continuous_metrics)
+
+    assert np.array_equal(continuous_metrics[0].confusion, batch_metrics[0].confusion)
+    assert np.all(model.timesteps_used == 50)
+
+
+def test_model_continuous_batching_budgets():
+    '''
+    Test samples with different presentation times are each presented for their own time.
+    '''
+
+    x, y, weights = model_data()
+    model = build_model('test_model_continuous_batching_budgets', weights, batch_size=4,
+                        continuous_batching=True)
+
+    time = np.tile([20.0, 50.0], 5)
+    model.evaluate_continuous([x], [y], time)
+
+    assert np.array_equal(model.timesteps_used, time.astype(int))
+
+
+if __name__ == '__main__':
+    test_model_device_dataset()
+    test_model_predict()
+    test_model_partial_batch_lanes()
+    test_model_evaluate_stream()
+    test_model_evaluate_stream_error()
+    test_model_predict_stream()
+    test_model_checkpoints()
+    test_model_checkpoints_invalid()
+    test_model_device_top_k()
+    test_model_continuous_batching()
+    test_model_continuous_batching_budgets()
@@ -0,0 +1,102 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from ml_genn.converters import DataNorm, FewSpike
+from ml_genn.converters.norm_cache import get_tf_model_key, get_mlg_model_key
+from ml_genn.layers import InputLayer, Dense, IFNeurons
+
+
+def build_tf_model(name, seed=1234):
+    rng = np.random.RandomState(seed)
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(8, name='hidden', activation='relu', use_bias=False, input_shape=(10,)),
+        tf.keras.layers.Dense(4, name='output', activation='relu', use_bias=False),
+    ], name=name)
+    tf_model.set_weights([rng.uniform(size=(10, 8)).astype(np.float32),
+                          rng.uniform(size=(8, 4)).astype(np.float32)])
+    return tf_model
+
+
+def build_mlg_model(weights):
+    inputs = InputLayer('input', (4,))
+    dense = Dense('dense', 3, neurons=IFNeurons())
+    dense.connect([inputs])
+    dense.set_weights([weights])
+
+    model = mlg.Model()
+    model.set_network([inputs], [dense], name='norm_cache_test')
+    return model
+
+
+def raise_if_called(*args, **kwargs):
+    raise AssertionError('cached normalisation results were recalculated')
+
+
+def test_norm_cache_data_norm(tmpdir, monkeypatch):
+    '''
+    Test converting with DataNorm again with the same cache directory reads thresholds from the cache.
+    '''
+
+    x = np.random.RandomState(1).uniform(size=(16, 10)).astype(np.float32)
+    tf_model = build_tf_model('test_norm_cache_data_norm')
+
+    thresholds = DataNorm([x], cache_dir=str(tmpdir)).pre_compile(tf_model).thresholds
+    assert len(tmpdir.listdir(lambda p: p.ext == '.json')) == 1
+
+    monkeypatch.setattr(DataNorm, '_calc_thresholds', raise_if_called)
+    cached_thresholds = DataNorm([x], cache_dir=str(tmpdir)).pre_compile(tf_model).thresholds
+
+    assert cached_thresholds == thresholds
+
+
+def test_norm_cache_few_spike(tmpdir, monkeypatch):
+    '''
+    Test converting with FewSpike again with the same cache directory reads maximum activations from the cache.
+    '''
+
+    x = np.random.RandomState(1).uniform(size=(16, 10)).astype(np.float32)
+    tf_model = build_tf_model('test_norm_cache_few_spike')
+
+    pre_compile_output = FewSpike(norm_data=[x], cache_dir=str(tmpdir)).pre_compile(tf_model)
+
+    monkeypatch.setattr(FewSpike, '_calc_max_activations', raise_if_called)
+    cached_pre_compile_output = FewSpike(norm_data=[x], cache_dir=str(tmpdir)).pre_compile(tf_model)
+
+    assert cached_pre_compile_output.max_activations == pre_compile_output.max_activations
+    assert cached_pre_compile_output.max_input == pre_compile_output.max_input
+
+
+def test_norm_cache_tf_model_key_changes():
+    '''
+    Test changes to weights, normalisation data or converter parameters change the cache key.
+    '''
+
+    x = np.random.RandomState(1).uniform(size=(16, 10)).astype(np.float32)
+    tf_model = build_tf_model('test_norm_cache_tf_model_key_changes')
+    key = get_tf_model_key('data-norm', tf_model, [x], percentile=None, per_channel=False)
+
+    assert key == get_tf_model_key('data-norm', tf_model, [x], percentile=None, per_channel=False)
+
+    other_tf_model = build_tf_model('test_norm_cache_tf_model_key_changes', seed=4321)
+    assert key != get_tf_model_key('data-norm', other_tf_model, [x], percentile=None, per_channel=False)
+    assert key != get_tf_model_key('data-norm', tf_model, [x[:8]], percentile=None, per_channel=False)
+    assert key != get_tf_model_key('data-norm', tf_model, [x], percentile=99.9, per_channel=False)
+    assert key != get_tf_model_key('data-norm', tf_model, [x], percentile=None, per_channel=True)
+
+
+def test_norm_cache_mlg_model_key_changes():
+    '''
+    Test changes to ML GeNN model weights, normalisation data or converter parameters change the cache key.
+    '''
+
+    x = np.random.RandomState(1).uniform(size=(16, 4)).astype(np.float32)
+    mlg_model = build_mlg_model(np.ones((4, 3)))
+    key = get_mlg_model_key('spike-norm', mlg_model, [x], patience=None, per_channel=False)
+
+    assert key == get_mlg_model_key('spike-norm', mlg_model, [x], patience=None, per_channel=False)
+
+    other_mlg_model = build_mlg_model(np.zeros((4, 3)))
+    assert key != get_mlg_model_key('spike-norm', other_mlg_model, [x], patience=None, per_channel=False)
+    assert key != get_mlg_model_key('spike-norm', mlg_model, [x[:8]], patience=None, per_channel=False)
+    assert key != get_mlg_model_key('spike-norm', mlg_model, [x], patience=10, per_channel=False)
+    assert key != get_mlg_model_key('spike-norm', mlg_model, [x], patience=None, per_channel=True)
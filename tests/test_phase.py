@@ -0,0 +1,36 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+
+
+def test_phase_dense():
+    '''
+    Test phase coding conversion of Dense model approximates TensorFlow outputs.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Inputs
+    rng = np.random.RandomState(1234)
+    x = rng.uniform(size=(1, 10)).astype(np.float32)
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(8, name='hidden', activation='relu', use_bias=False, input_shape=(10,)),
+        tf.keras.layers.Dense(4, name='output', activation='relu', use_bias=False),
+    ], name='test_phase_dense')
+    tf_model.set_weights([rng.uniform(0.0, 1.0, size=(10, 8)).astype(np.float32),
+                          rng.uniform(0.0, 1.0, size=(8, 4)).astype(np.float32)])
+    tf_y = tf_model(x).numpy()
+
+    # Convert and run ML GeNN model for 64 periods
+    converter = mlg.converters.Phase(norm_data=[x], K=8)
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=converter,
+                                           dt=1.0, batch_size=1)
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(64 * 8)
+
+    # Weighted spikes per period encode output relative to its maximum
+    mlg_y = mlg_model.outputs[0].neurons.get_scores(1) * tf_y.max() / 64.0
+    assert np.allclose(mlg_y, tf_y, rtol=0.0, atol=0.1 * tf_y.max())
@@ -0,0 +1,40 @@
+import numpy as np
+import ml_genn as mlg
+from ml_genn.layers import InputLayer, Conv2D, AvePool2DDense
+from ml_genn.layers import IFNeurons, SpikeInputNeurons
+
+
+def test_save_load_roundtrip(tmpdir):
+    '''
+    Test saving and loading a model restores its graph, neurons and weights.
+    '''
+
+    rng = np.random.RandomState(1234)
+
+    inputs = InputLayer('input', (8, 8, 1), SpikeInputNeurons())
+    conv = Conv2D('conv', 4, (3, 3), conv_padding='same', neurons=IFNeurons(0.5))
+    conv.connect([inputs])
+    conv.set_weights([rng.rand(3, 3, 1, 4)])
+    dense = AvePool2DDense('dense', 10, (2, 2), neurons=IFNeurons(np.inf))
+    dense.connect([conv])
+    dense.set_weights([rng.rand(64, 10)])
+
+    model = mlg.Model()
+    model.set_network([inputs], [dense], name='test_save_load')
+    mlg.save_model(model, str(tmpdir))
+    loaded = mlg.load_model(str(tmpdir))
+
+    assert loaded.name == 'test_save_load'
+    assert [l.name for l in loaded.inputs] == ['input']
+    assert [l.name for l in loaded.outputs] == ['dense']
+    assert sorted(l.name for l in loaded.layers) == ['conv', 'dense', 'input']
+
+    for layer in model.layers:
+        loaded_layer = next(l for l in loaded.layers if l.name == layer.name)
+        assert type(loaded_layer) is type(layer)
+        assert type(loaded_layer.neurons) is type(layer.neurons)
+        assert loaded_layer.shape == layer.shape
+        if isinstance(layer.neurons, IFNeurons):
+            assert loaded_layer.neurons.threshold == layer.neurons.threshold
+        if layer is not inputs:
+            assert np.array_equal(loaded_layer.get_weights()[0], layer.get_weights()[0])
@@ -0,0 +1,46 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+
+
+def test_ttfs_dense():
+    '''
+    Test TTFS conversion of Dense model approximates TensorFlow outputs.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Inputs
+    rng = np.random.RandomState(1234)
+    x = rng.uniform(size=(1, 10)).astype(np.float32)
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(8, name='hidden', activation='relu', use_bias=False, input_shape=(10,)),
+        tf.keras.layers.Dense(4, name='output', use_bias=False),
+    ], name='test_ttfs_dense')
+    tf_model.set_weights([rng.uniform(-0.5, 1.0, size=(10, 8)).astype(np.float32),
+                          rng.uniform(-1.0, 1.0, size=(8, 4)).astype(np.float32)])
+    hidden_y = tf.keras.backend.function(tf_model.inputs, [tf_model.layers[0].output])([x])[0]
+    tf_y = tf_model(x).numpy()
+
+    # Convert and run ML GeNN model
+    converter = mlg.converters.TTFS(norm_data=[x], window=256)
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=converter,
+                                           dt=1.0, batch_size=1)
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(mlg_model.calc_timesteps(converter.calc_presentation_time(tf_model)))
+
+    # Each neuron spikes at most once, only if its activation is positive
+    hidden_nrn = mlg_model.layers[1].neurons.nrn
+    hidden_nrn.pull_var_from_device('nSpk')
+    hidden_spikes = hidden_nrn.vars['nSpk'].view.reshape(hidden_y.shape)
+    assert np.all(hidden_spikes <= 1)
+    assert np.all(hidden_spikes[hidden_y <= 0.0] == 0)
+
+    # Output potential encodes output relative to hidden layer's scale
+    output_neurons = mlg_model.outputs[0].neurons
+    mlg_y = output_neurons.get_scores(1) * hidden_y.max() / 256.0
+    assert np.allclose(mlg_y, tf_y, rtol=0.0, atol=0.05 * np.abs(tf_y).max())
+    assert np.array_equal(output_neurons.get_predictions(1), tf_y.argmax(axis=1))